@@ -0,0 +1,76 @@
+import shutil
+import time
+from typing import Callable, Optional
+
+from requests.exceptions import ConnectionError as RequestConnectionError, HTTPError, Timeout
+
+from app_utils.cards import SavedDataDeck
+from plugins_management.http_sessions import HostRateLimiter, session_registry
+
+
+def fetch_audio(url: str, save_path: str, headers: dict, timeout: float = 5,
+                exception_action: Callable[[Exception], None] = lambda exc: None) -> bool:
+    try:
+        r = session_registry.get(url, headers=headers, timeout=timeout)
+        r.raise_for_status()
+    except Exception as e:
+        exception_action(e)
+        return False
+    audio_bin = r.content
+    with open(save_path, "wb") as audio_file:
+        audio_file.write(audio_bin)
+    return True
+
+
+def is_retriable(exception: Exception) -> bool:
+    if isinstance(exception, (RequestConnectionError, Timeout)):
+        return True
+    if isinstance(exception, HTTPError) and exception.response is not None:
+        return exception.response.status_code == 429 or exception.response.status_code >= 500
+    return False
+
+
+class AudioFetcher:
+    """
+    Thread safe writer of saved audios to their destinations. Doesn't depend on Tk
+    """
+    __slots__ = "headers", "timeout", "max_retries", "retry_backoff", "_rate_limiter"
+
+    def __init__(self, headers: dict, timeout: float,
+                 request_delay: int = 300, max_retries: int = 3, retry_backoff: float = 1.0):
+        """
+        :param request_delay: minimal delay (in ms) between two requests to the same host
+        """
+        self.headers = headers
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self._rate_limiter = HostRateLimiter(min_interval=request_delay / 1000)
+
+    def fetch_with_retries(self, url: str, save_path: str) -> Optional[Exception]:
+        """
+        :return: last fetching error or None on success
+        """
+        errors = []
+        for attempt in range(self.max_retries + 1):
+            if attempt:
+                time.sleep(self.retry_backoff * 2 ** (attempt - 1))
+            self._rate_limiter.wait(url)
+            if fetch_audio(url, save_path, self.headers, self.timeout, errors.append):
+                return None
+            if not is_retriable(errors[-1]):
+                break
+        return errors[-1]
+
+    def write_to_dst(self, src_type: str, src: str, dst: str) -> Optional[Exception]:
+        """
+        :return: error or None on success
+        """
+        try:
+            if src_type == SavedDataDeck.AUDIO_SRC_TYPE_WEB:
+                return self.fetch_with_retries(src, dst)
+            if src_type == SavedDataDeck.AUDIO_SRC_TYPE_LOCAL:
+                shutil.copy(src, dst)
+        except Exception as e:
+            return e
+        return None
@@ -1,16 +1,18 @@
 import os
-import shutil
+from concurrent.futures import ThreadPoolExecutor
 from enum import IntEnum
+from queue import Empty, SimpleQueue
 from tkinter import Button, Checkbutton, Label, Toplevel, BooleanVar
 from tkinter import messagebox
 from tkinter import ttk
+from typing import Optional
 
-import requests
-
+from app_utils.audio_fetching import AudioFetcher, fetch_audio
 from app_utils.cards import SavedDataDeck
 from app_utils.storages import FrozenDict
 from app_utils.window_utils import spawn_window_in_center
 from plugins_loading.containers import LanguagePackageContainer
+from plugins_management.http_sessions import POOL_SIZE
 
 
 class AudioDownloader(Toplevel):
@@ -21,7 +23,8 @@ class AudioDownloader(Toplevel):
 
     def __init__(self, master, headers: dict, timeout: int,
                  lang_pack: LanguagePackageContainer,
-                 request_delay: int = 5_000,
+                 request_delay: int = 300, max_workers: int = POOL_SIZE,
+                 max_retries: int = 3, retry_backoff: float = 1.0,
                  temp_dir: str = "./", saving_dir: str = "./", local_media_dir: str = "./",
                  toplevel_cfg: dict = None, pb_cfg: dict = None, label_cfg: dict = None,
                  button_cfg: dict = None, checkbutton_cfg: dict = None):
@@ -50,9 +53,16 @@ class AudioDownloader(Toplevel):
         self.temp_dir = temp_dir
         self.saving_dir = saving_dir
         self.local_media_dir = local_media_dir
-        self.headers = headers
-        self.timeout = timeout
-        self.request_delay = request_delay
+        self.poll_interval = 50
+        self._fetcher = AudioFetcher(headers=headers, timeout=timeout, request_delay=request_delay,
+                                     max_retries=max_retries, retry_backoff=retry_backoff)
+        self._pool = ThreadPoolExecutor(max_workers=max_workers)
+        self._results: SimpleQueue = SimpleQueue()
+        self._n_items = 0
+        self._n_finished = 0
+        self._all_scheduled = False
+        self._poll_job = None
+        self._closed = False
         self.errors = {"error_types": {}, "missing_audios": []}
 
         self.withdraw()
@@ -70,6 +80,7 @@ class AudioDownloader(Toplevel):
         self.current_word_label = Label(self, **self.label_cfg)
         self.current_word_label.grid(column=0, row=1, sticky="news")
         self.label_cfg.pop("relief", None)
+        self.protocol("WM_DELETE_WINDOW", self.destroy)
         self.deiconify()
         spawn_window_in_center(master, self)
 
@@ -83,135 +94,148 @@ class AudioDownloader(Toplevel):
 
     @staticmethod
     def fetch_audio(url, save_path, headers, timeout=5, exception_action=lambda exc: None) -> bool:
-        try:
-            r = requests.get(url, headers=headers, timeout=timeout)
-            r.raise_for_status()
-        except Exception as e:
-            exception_action(e)
-            return False
-        audio_bin = r.content
-        with open(save_path, "wb") as audio_file:
-            audio_file.write(audio_bin)
-        return True
+        return fetch_audio(url, save_path, headers, timeout, exception_action)
+
+    def _write_to_dst(self, src_type: str, src: str, dst: str) -> None:
+        """
+        Runs in a worker thread. Reports (dst, error) to the UI thread through results queue
+        """
+        self._results.put((dst, self._fetcher.write_to_dst(src_type, src, dst)))
+
+    def _report_progress(self, dst: str, error: Optional[Exception] = None) -> None:
+        self._n_finished += 1
+        self.pb["value"] = min(100.0, round(self._n_finished / self._n_items * 100, 2))
+        self.current_word_label["text"] = os.path.split(dst)[-1]
+        if error is not None:
+            self.catch_fetching_error(error)
+
+    def _ask_copy_encounter_action(self, dst: str) -> "AudioDownloader.CopyEncounterAction":
+        chosen_action = AudioDownloader.CopyEncounterAction.SKIP
+
+        def skip_encounter():
+            if apply_to_all_var.get():
+                self.if_copy_encountered = AudioDownloader.CopyEncounterAction.SKIP
+            copy_encounter_tl.destroy()
+            self.grab_set()
+
+        def rewrite_encounter():
+            nonlocal chosen_action
+            chosen_action = AudioDownloader.CopyEncounterAction.REWRITE
+            if apply_to_all_var.get():
+                self.if_copy_encountered = AudioDownloader.CopyEncounterAction.REWRITE
+            copy_encounter_tl.destroy()
+            self.grab_set()
+
+        apply_to_all_var = BooleanVar()
+
+        copy_encounter_tl = Toplevel(self, **self.toplevel_cfg)
+        copy_encounter_tl.withdraw()
+
+        message = self.lang_pack.audio_downloader_file_exists_message.format(dst)
+
+        encounter_label = Label(copy_encounter_tl, text=message, relief="ridge",
+                                wraplength=self.winfo_width() * 2 // 3, **self.label_cfg)
+
+        skip_encounter_button = Button(copy_encounter_tl,
+                                       text=self.lang_pack.audio_downloader_skip_encounter_button_text,
+                                       command=skip_encounter,
+                                       **self.button_cfg)
+        rewrite_encounter_button = Button(copy_encounter_tl,
+                                          text=self.lang_pack.audio_downloader_rewrite_encounter_button_text,
+                                          command=rewrite_encounter,
+                                          **self.button_cfg)
+        apply_to_all_button = Checkbutton(copy_encounter_tl,
+                                          variable=apply_to_all_var,
+                                          text=self.lang_pack.audio_downloader_apply_to_all_button_text,
+                                          **self.checkbutton_cfg)
+
+        encounter_label.grid(row=0, column=0, padx=5, pady=5, sticky="news")
+        skip_encounter_button.grid(row=1, column=0, padx=5, pady=5, sticky="news")
+        rewrite_encounter_button.grid(row=2, column=0, padx=5, pady=5, sticky="news")
+        apply_to_all_button.grid(row=3, column=0, padx=5, pady=5, sticky="news")
+
+        copy_encounter_tl.deiconify()
+        spawn_window_in_center(self, copy_encounter_tl)
+
+        copy_encounter_tl.bind("<Escape>", lambda event: copy_encounter_tl.destroy())
+        self.wait_window(copy_encounter_tl)
+        if not self._closed:
+            self.grab_set()
+        return chosen_action
+
+    def _poll_results(self) -> None:
+        self._poll_job = None
+        while True:
+            try:
+                dst, error = self._results.get_nowait()
+            except Empty:
+                break
+            self._report_progress(dst, error)
+
+        if self._all_scheduled and self._n_finished == self._n_items:
+            self._finish()
+            return
+        self._poll_job = self.after(self.poll_interval, self._poll_results)
+
+    def destroy(self):
+        self._closed = True
+        self._pool.shutdown(wait=False, cancel_futures=True)
+        if self._poll_job is not None:
+            self.after_cancel(self._poll_job)
+            self._poll_job = None
+        super(AudioDownloader, self).destroy()
+
+    def _finish(self) -> None:
+        if self.errors["missing_audios"]:
+            absent_audio_words = ", ".join(self.errors['missing_audios'])
+            n_errors = f"{self.lang_pack.audio_downloader_n_errors_message_prefix}: " \
+                       f"{len(self.errors['missing_audios'])}\n"
+            for error_type in self.errors["error_types"]:
+                n_errors += f"{error_type}: {self.errors['error_types'][error_type]}\n"
+
+            error_message = f"{n_errors}\n\n{absent_audio_words}"
+            messagebox.showerror(message=error_message)
+        self.destroy()
 
     def download_audio(self, audio_links_list: list[FrozenDict]):
-        item_gen = [(item[SavedDataDeck.AUDIO_SRCS_TYPE], src, dst)
-                     for item in audio_links_list
-                     for src, dst in zip(item[SavedDataDeck.AUDIO_SRCS], item[SavedDataDeck.AUDIO_SAVING_PATHS])]
-        length = len(item_gen)
-
-        def iterate(src_type: str, src: str, dst: str, index: int = 1):
-            """
-            :param index:
-            :param word:
-            :param pos:
-            :param wp_name:
-            :param url:
-            :return:
-            """
-            def write_to_dst(_src_type: str, _src: str, _dst: str) -> bool:
-                wait_flag = False
-                if _src_type == SavedDataDeck.AUDIO_SRC_TYPE_WEB:
-                    wait_flag = self.fetch_audio(_src, _dst, self.headers, self.timeout,
-                                                 self.catch_fetching_error)
-
-                elif _src_type == SavedDataDeck.AUDIO_SRC_TYPE_LOCAL:
-                    shutil.copy(src, _dst)
-                return wait_flag
-
-            self.pb["value"] = min(100.0, round(index / length * 100, 2))
-
-            dst_filename = os.path.split(dst)[-1]
-            self.current_word_label["text"] = dst_filename
-            self.update()
-
-            temp_audio_path = os.path.join(self.temp_dir, dst_filename)
-
-            wait_before_next_batch = False
-            if dst not in self.already_processed_audios:
-                self.already_processed_audios.add(dst)
-                if not os.path.exists(dst) or self.if_copy_encountered == AudioDownloader.CopyEncounterAction.REWRITE:
-                    if os.path.exists(temp_audio_path):
-                        os.rename(temp_audio_path, dst)
-                        wait_before_next_batch = False
-                    else:
-                        wait_before_next_batch = write_to_dst(src_type, src, dst)
-
-                elif self.if_copy_encountered == AudioDownloader.CopyEncounterAction.SKIP:
-                    wait_before_next_batch = False
-                else:
-                    def skip_encounter():
-                        nonlocal wait_before_next_batch
-                        if apply_to_all_var.get():
-                            self.if_copy_encountered = AudioDownloader.CopyEncounterAction.SKIP
-                        wait_before_next_batch = False
-                        copy_encounter_tl.destroy()
-                        self.grab_set()
-
-                    def rewrite_encounter():
-                        nonlocal wait_before_next_batch
-                        if apply_to_all_var.get():
-                            self.if_copy_encountered = AudioDownloader.CopyEncounterAction.REWRITE
-                        copy_encounter_tl.destroy()
-                        self.grab_set()
-                        wait_before_next_batch = write_to_dst(src_type, src, dst)
-
-                    apply_to_all_var = BooleanVar()
-
-                    copy_encounter_tl = Toplevel(self, **self.toplevel_cfg)
-                    copy_encounter_tl.withdraw()
-
-                    message = self.lang_pack.audio_downloader_file_exists_message.format(dst)
-
-                    encounter_label = Label(copy_encounter_tl, text=message, relief="ridge",
-                                            wraplength=self.winfo_width() * 2 // 3, **self.label_cfg)
-
-                    skip_encounter_button = Button(copy_encounter_tl,
-                                                   text=self.lang_pack.audio_downloader_skip_encounter_button_text,
-                                                   command=skip_encounter,
-                                                   **self.button_cfg)
-                    rewrite_encounter_button = Button(copy_encounter_tl,
-                                                      text=self.lang_pack.audio_downloader_rewrite_encounter_button_text,
-                                                      command=rewrite_encounter,
-                                                      **self.button_cfg)
-                    apply_to_all_button = Checkbutton(copy_encounter_tl,
-                                                      variable=apply_to_all_var,
-                                                      text=self.lang_pack.audio_downloader_apply_to_all_button_text,
-                                                      **self.checkbutton_cfg)
-
-                    encounter_label.grid(row=0, column=0, padx=5, pady=5, sticky="news")
-                    skip_encounter_button.grid(row=1, column=0, padx=5, pady=5, sticky="news")
-                    rewrite_encounter_button.grid(row=2, column=0, padx=5, pady=5, sticky="news")
-                    apply_to_all_button.grid(row=3, column=0, padx=5, pady=5, sticky="news")
-
-                    copy_encounter_tl.deiconify()
-                    spawn_window_in_center(self, copy_encounter_tl)
-
-                    copy_encounter_tl.bind("<Escape>", lambda event: copy_encounter_tl.destroy())
-                    self.wait_window(copy_encounter_tl)
-                    self.grab_set()
-            else:
-                wait_before_next_batch = False
-
-            if item_gen:
-                delay = self.request_delay if wait_before_next_batch else 0
-                src_type, src, dst = item_gen.pop(0)
-                self.master.after(delay, lambda: iterate(src_type, src, dst, index + 1))
+        items = [(item[SavedDataDeck.AUDIO_SRCS_TYPE], src, dst)
+                 for item in audio_links_list
+                 for src, dst in zip(item[SavedDataDeck.AUDIO_SRCS], item[SavedDataDeck.AUDIO_SAVING_PATHS])]
+        if not items:
+            self.destroy()
+            return
+
+        self._n_items = len(items)
+        self._n_finished = 0
+        self._all_scheduled = False
+        self._poll_job = self.after(self.poll_interval, self._poll_results)
+
+        # conflicts are resolved here, on the UI thread, in the original order.
+        # Downloads that are already scheduled keep running while a conflict dialog is shown
+        for src_type, src, dst in items:
+            # the window can be closed while a conflict dialog is shown
+            if self._closed:
                 return
+            if dst in self.already_processed_audios:
+                self._report_progress(dst)
+                continue
+            self.already_processed_audios.add(dst)
+
+            if not os.path.exists(dst) or self.if_copy_encountered == AudioDownloader.CopyEncounterAction.REWRITE:
+                action = AudioDownloader.CopyEncounterAction.REWRITE
+            elif self.if_copy_encountered == AudioDownloader.CopyEncounterAction.SKIP:
+                action = AudioDownloader.CopyEncounterAction.SKIP
+            else:
+                action = self._ask_copy_encounter_action(dst)
 
-            if self.errors["missing_audios"]:
-                absent_audio_words = ", ".join(self.errors['missing_audios'])
-                n_errors = f"{self.lang_pack.audio_downloader_n_errors_message_prefix}: " \
-                           f"{len(self.errors['missing_audios'])}\n"
-                for error_type in self.errors["error_types"]:
-                    n_errors += f"{error_type}: {self.errors['error_types'][error_type]}\n"
-
-                error_message = f"{n_errors}\n\n{absent_audio_words}"
-                messagebox.showerror(message=error_message)
-            self.destroy()
+            if action == AudioDownloader.CopyEncounterAction.SKIP:
+                self._report_progress(dst)
+                continue
 
-        if item_gen:
-            src_type, src, dst = item_gen.pop(0)
-            iterate(src_type, src, dst, 1)
-        else:
-            self.destroy()
+            temp_audio_path = os.path.join(self.temp_dir, os.path.split(dst)[-1])
+            if os.path.exists(temp_audio_path):
+                os.replace(temp_audio_path, dst)
+                self._report_progress(dst)
+            else:
+                self._pool.submit(self._write_to_dst, src_type, src, dst)
+        self._all_scheduled = True
@@ -0,0 +1,129 @@
+from concurrent.futures import ThreadPoolExecutor
+from queue import Empty, SimpleQueue
+from tkinter import Label, Toplevel
+from tkinter import ttk
+from typing import Callable, Optional
+
+from app_utils.cards import Card
+from app_utils.window_utils import spawn_window_in_center
+from plugins_loading.containers import LanguagePackageContainer
+from plugins_management.http_sessions import HostRateLimiter
+
+# (word, found cards or None if defining failed, error)
+DefinitionResult = tuple[str, Optional[list[Card]], Optional[Exception]]
+
+
+class BatchDefiner(Toplevel):
+    """
+    Defines a list of words in worker threads and shows progress without blocking the UI.
+    Results are handed to on_done at once, in the order of the words.
+    Closing the window cancels the words that are not defined yet: on_done gets only the finished definitions
+    """
+    def __init__(self, master,
+                 get_cards: Callable[[str], list[Card]],
+                 on_done: Callable[[list[DefinitionResult]], None],
+                 lang_pack: LanguagePackageContainer,
+                 max_workers: int = 4, request_delay: int = 300, rate_limit_key: str = "",
+                 toplevel_cfg: dict = None, pb_cfg: dict = None, label_cfg: dict = None):
+        """
+        :param get_cards: called from worker threads
+        :param request_delay: minimal delay (in ms) between starts of two definitions
+        :param rate_limit_key: definitions with the same key share request_delay (for example, the same site)
+        """
+        if toplevel_cfg is None:
+            toplevel_cfg = {}
+        super(BatchDefiner, self).__init__(master, **toplevel_cfg)
+
+        self.lang_pack = lang_pack
+        if pb_cfg is None:
+            pb_cfg = {}
+        pb_cfg.pop("orient", None)
+        pb_cfg.pop("mode", None)
+        if label_cfg is None:
+            label_cfg = {}
+
+        self.get_cards = get_cards
+        self.on_done = on_done
+        self.rate_limit_key = rate_limit_key
+        self.poll_interval = 50
+        self._rate_limiter = HostRateLimiter(min_interval=request_delay / 1000)
+        self._pool = ThreadPoolExecutor(max_workers=max_workers)
+        self._results: SimpleQueue = SimpleQueue()
+        self._definitions: list[Optional[DefinitionResult]] = []
+        self._n_finished = 0
+        self._poll_job = None
+
+        self.withdraw()
+        self.title(self.lang_pack.batch_define_progress_title)
+
+        self.pb = ttk.Progressbar(self,
+                                  orient='horizontal',
+                                  mode='determinate',
+                                  **pb_cfg)
+        self.grid_columnconfigure(0, weight=1)
+        self.pb.grid(column=0, row=0, padx=5, pady=5, sticky="news")
+        self.current_word_label = Label(self, **label_cfg)
+        self.current_word_label.grid(column=0, row=1, sticky="news")
+        self.protocol("WM_DELETE_WINDOW", self.cancel)
+        self.bind("<Escape>", lambda event: self.cancel())
+        self.deiconify()
+        spawn_window_in_center(master, self)
+
+    def _define(self, index: int, word: str) -> None:
+        """
+        Runs in a worker thread
+        """
+        self._rate_limiter.wait_host(self.rate_limit_key)
+        try:
+            self._results.put((index, (word, self.get_cards(word), None)))
+        except Exception as e:
+            self._results.put((index, (word, None, e)))
+
+    def _poll_results(self) -> None:
+        self._poll_job = None
+        while True:
+            try:
+                index, definition = self._results.get_nowait()
+            except Empty:
+                break
+            self._definitions[index] = definition
+            self._n_finished += 1
+            self.pb["value"] = self._n_finished / len(self._definitions) * 100
+            self.current_word_label["text"] = f"{definition[0]} ({self._n_finished}/{len(self._definitions)})"
+
+        if self._n_finished == len(self._definitions):
+            self._finish()
+            return
+        self._poll_job = self.after(self.poll_interval, self._poll_results)
+
+    def _finish(self) -> None:
+        definitions = [definition for definition in self._definitions if definition is not None]
+        self.destroy()
+        self.on_done(definitions)
+
+    def define(self, words: list[str]) -> None:
+        self._definitions = [None] * len(words)
+        self._n_finished = 0
+        for index, word in enumerate(words):
+            self._pool.submit(self._define, index, word)
+        self._poll_job = self.after(self.poll_interval, self._poll_results)
+
+    def cancel(self) -> None:
+        """
+        Stops defining and hands already finished definitions to on_done
+        """
+        self._pool.shutdown(wait=False, cancel_futures=True)
+        while True:
+            try:
+                index, definition = self._results.get_nowait()
+            except Empty:
+                break
+            self._definitions[index] = definition
+        self._finish()
+
+    def destroy(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)
+        if self._poll_job is not None:
+            self.after_cancel(self._poll_job)
+            self._poll_job = None
+        super(BatchDefiner, self).destroy()
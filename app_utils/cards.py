@@ -2,15 +2,68 @@ import json
 import os
 from abc import ABC, abstractmethod
 from enum import Enum
-from typing import Callable, Union, Any
+from collections.abc import Mapping, Sequence
+from typing import Callable, Union, Any, Optional, Iterator
 
 from plugins_management.parsers_return_types import SentenceGenerator
 
+from app_utils.journal import Journal, atomic_json_dump, get_journal_path, run_compaction
+from app_utils.local_dictionary import BinaryDictionary, load_local_dictionary
+from app_utils.search_checker import FieldIndex
 from app_utils.storages import FrozenDictJSONEncoder
-from app_utils.storages import PointerList, FrozenDict
+from app_utils.storages import GapBuffer, PointerList, FrozenDict
+from app_utils.string_utils import SearchType
+from app_utils.word_index import WordIndex
 from consts.card_fields import FIELDS
 
 
+class TagRenderer:
+    """
+    Renders dictionary tags of many cards with the same settings.
+    Processed tags are memoized, because tag vocabularies are small and repeat across cards
+    """
+    __slots__ = "sep", "tag_processor", "_processed"
+
+    def __init__(self, sep: str = "::", tag_processor: Callable[[str], str] = lambda x: x):
+        self.sep = sep
+        self.tag_processor = tag_processor
+        self._processed: dict[tuple[type, Any], str] = {}
+
+    def _process(self, tag: Any) -> str:
+        # equal tags of different types (1, 1.0 and True) can be processed differently
+        key = (type(tag), tag)
+        try:
+            processed = self._processed.get(key)
+        except TypeError:  # unhashable tags (like lists nested in lists) aren't memoized
+            return self.tag_processor(tag)
+        if processed is None:
+            processed = self._processed[key] = self.tag_processor(tag)
+        return processed
+
+    def _traverse(self, res_container: list[str], current_item: Mapping, cur_stage_prefix: str) -> None:
+        for key, value in current_item.items():
+            cur_prefix = f"{cur_stage_prefix}{self._process(key)}{self.sep}"
+
+            if isinstance(value, Mapping):
+                self._traverse(res_container, value, cur_prefix)
+            elif isinstance(value, list):
+                for item in value:
+                    if isinstance(item, Mapping):
+                        self._traverse(res_container, item, cur_prefix)
+                    else:
+                        res_container.append(f"{cur_prefix}{self._process(item)}")
+            else:
+                res_container.append(f"{cur_prefix}{self._process(value)}")
+
+    def render(self, card_data: Mapping, prefix: str = "") -> str:
+        if (dictionary_tags := card_data.get(FIELDS.dict_tags)) is None:
+            return ""
+
+        tags_container = []
+        self._traverse(tags_container, dictionary_tags, f"{prefix}{self.sep}" if prefix else "")
+        return " ".join(tags_container)
+
+
 class Card(FrozenDict):
     __slots__ = ()
 
@@ -29,30 +82,10 @@ class Card(FrozenDict):
                           prefix: str = "",
                           sep: str = "::",
                           tag_processor: Callable[[str], str] = lambda x: x) -> str:
-        if (dictionary_tags := card_data.get(FIELDS.dict_tags)) is None:
-            return ""
-
-        def traverse_tags_dict(res_container: list[str], current_item: dict, cur_stage_prefix: str = ""):
-            nonlocal sep
-
-            for key in current_item:
-                cur_prefix = f"{cur_stage_prefix}{tag_processor(key)}{sep}"
-
-                if isinstance((value := current_item[key]), dict):
-                    traverse_tags_dict(res_container, value, cur_prefix)
-                elif isinstance(value, list):
-                    for item in value:
-                        if isinstance(item, dict):
-                            traverse_tags_dict(res_container, item, cur_prefix)
-                        else:
-                            res_container.append(f"{cur_prefix}{tag_processor(item)}")
-                else:
-                    res_container.append(f"{cur_prefix}{tag_processor(value)}")
-
-        tags_container = []
-        p = f"{prefix}{sep}" if prefix else ""
-        traverse_tags_dict(tags_container, dictionary_tags, cur_stage_prefix=p)
-        return " ".join(tags_container)
+        """
+        Renders tags of a single card. TagRenderer should be used for many cards
+        """
+        return TagRenderer(sep=sep, tag_processor=tag_processor).render(card_data, prefix)
 
 
 class CardGenerator(ABC):
@@ -63,15 +96,20 @@ class CardGenerator(ABC):
         self.scheme_docs = scheme_docs
 
     @abstractmethod
-    def _get_search_subset(self, query: str) -> list[tuple[str, dict]]:
+    def _get_search_subset(self, query: str, search_type: SearchType) -> list[tuple[str, dict]]:
         pass
 
     def get(self, query: str, word_filter: Callable[[str], bool],
-            additional_filter: Callable[[Card], bool] = None) -> list[Card]:
+            additional_filter: Callable[[Card], bool] = None,
+            search_type: SearchType = SearchType.EVERYWHERE) -> list[Card]:
+        """
+        :param search_type: the way word_filter matches query. Lets generators skip
+        headwords that can't pass word_filter
+        """
         if additional_filter is None:
             additional_filter = lambda _: True
 
-        source: list[tuple[str, dict]] = self._get_search_subset(query)
+        source: list[tuple[str, dict]] = self._get_search_subset(query, search_type)
         res: list[Card] = []
         for word, word_data in source:
             if word_filter(word):
@@ -96,14 +134,15 @@ class LocalCardGenerator(CardGenerator):
         item_converter: Callable[[(str, dict)], dict]
         """
         super(LocalCardGenerator, self).__init__(item_converter, scheme_docs)
-        if not os.path.isfile(local_dict_path):
-            raise Exception(f"Local dictionary with path \"{local_dict_path}\" doesn't exist")
-
-        with open(local_dict_path, "r", encoding="UTF-8") as f:
-            self.local_dictionary: list[(str, dict)] = json.load(f)
+        self.local_dictionary: Sequence[tuple[str, Mapping]] = load_local_dictionary(local_dict_path)
+        headwords = self.local_dictionary.headwords() if isinstance(self.local_dictionary, BinaryDictionary) \
+            else (word for word, _ in self.local_dictionary)
+        self._word_index = WordIndex(headwords)
 
-    def _get_search_subset(self, query: str) -> list[tuple[str, dict]]:
-        return self.local_dictionary
+    def _get_search_subset(self, query: str, search_type: SearchType) -> Sequence[tuple[str, Mapping]]:
+        if (candidates := self._word_index.lookup(query, search_type)) is None:
+            return self.local_dictionary
+        return [self.local_dictionary[i] for i in candidates]
 
 
 class WebCardGenerator(CardGenerator):
@@ -118,12 +157,22 @@ class WebCardGenerator(CardGenerator):
         super(WebCardGenerator, self).__init__(item_converter, scheme_docs)
         self.parsing_function = parsing_function
 
-    def _get_search_subset(self, query: str) -> list[tuple[str, dict]]:
+    def _get_search_subset(self, query: str, search_type: SearchType) -> list[tuple[str, dict]]:
         return self.parsing_function(query)
 
 
 class Deck(PointerList):
-    __slots__ = "deck_path", "_card_generator", "_cards_left"
+    """
+    Changes are written to an append-only journal next to the deck file and are replayed
+    on top of the deck file on the next load. save compacts the journal into the deck file.
+    Moves of the pointer are not journaled one by one: flush_pointer writes the latest position.
+    It has to be called together with journaling of decisions about cards (SavedDataDeck),
+    otherwise the restored pointer doesn't match the restored decisions
+    """
+    JOURNAL_INSERT = "insert"
+    JOURNAL_POINTER = "pointer"
+
+    __slots__ = "deck_path", "_card_generator", "_cards_left", "_field_index", "_journal", "_journaled_pointer"
 
     def __init__(self, deck_path: str,
                  current_deck_pointer: int,
@@ -132,17 +181,20 @@ class Deck(PointerList):
         if os.path.isfile(self.deck_path):
             with open(self.deck_path, "r", encoding="UTF-8") as f:
                 deck: list[dict[str, Union[str, dict]]] = json.load(f)
-            super(Deck, self).__init__(data=deck,
-                                       starting_position=min(current_deck_pointer, len(deck) - 1),
+            self._journal = Journal(get_journal_path(self.deck_path))
+            data = GapBuffer(Card(card) for card in deck)
+            current_deck_pointer = self._replay_journal(data, current_deck_pointer)
+            super(Deck, self).__init__(data=data,
+                                       starting_position=min(current_deck_pointer, len(data) - 1),
                                        default_return_value=Card())
         else:
             raise Exception("Invalid _deck path!")
 
         self._card_generator: CardGenerator = card_generator
-        for i in range(len(self)):
-            self._data[i] = Card(self._data[i])
+        self._field_index = FieldIndex(self._data)
 
         self._cards_left = max(0, len(self) - self._pointer_position)
+        self._journaled_pointer = self._pointer_position
 
     def update_card_generator(self, cd: CardGenerator):
         self._card_generator = cd
@@ -154,43 +206,114 @@ class Deck(PointerList):
     def get_n_cards_left(self) -> int:
         return self._cards_left
 
+    def _replay_journal(self, data: GapBuffer, current_deck_pointer: int) -> int:
+        """
+        :return: deck pointer to start from
+        """
+        for record in self._journal.read():
+            if record["op"] == Deck.JOURNAL_INSERT:
+                # insertions that are already in the deck file were written before
+                # the deck got its current length
+                if record["length"] == len(data):
+                    data.insert_many(record["position"], (Card(card) for card in record["cards"]))
+            elif record["op"] == Deck.JOURNAL_POINTER:
+                # the same conversion as the one used for saving history
+                current_deck_pointer = record["position"] - 1
+        return current_deck_pointer
+
+    def flush_pointer(self) -> None:
+        """
+        Journals pointer position if it changed since the last time it was written
+        """
+        if self._pointer_position != self._journaled_pointer:
+            self._journal.append({"op": Deck.JOURNAL_POINTER, "position": self._pointer_position})
+            self._journaled_pointer = self._pointer_position
+
     def move(self, n: int) -> None:
         super(Deck, self).move(n)
         self._cards_left = max(0, len(self) - self._pointer_position)
 
     def find_card(self, searching_func: Callable[[Card], bool]) -> PointerList:
+        # search_checker.CardFilter can narrow down searched cards with the field index
+        plan = getattr(searching_func, "plan", None)
+        candidates, exact = plan(self._field_index) if plan is not None else (None, False)
         move_list = []
         last_found = self.get_pointer_position()
-        for current_index in range(self.get_pointer_position() + 1, len(self)):
-            if searching_func(self[current_index]):
+        for current_index, card in enumerate(self[last_found + 1:], last_found + 1):
+            if candidates is not None and id(card) not in candidates:
+                continue
+            if exact or searching_func(card):
                 move_list.append(current_index - last_found)
                 last_found = current_index
         return PointerList(data=move_list)
 
     def add_card_to_deck(self, query: str, **kwargs) -> int:
-        res: list[Card] = self._card_generator.get(query, **kwargs)
+        return self.add_cards_to_deck(self._card_generator.get(query, **kwargs))
 
-        self._data = self[:self._pointer_position] + res + self[self._pointer_position:]
+    def add_cards_to_deck(self, res: list[Card]) -> int:
+        """
+        Inserts cards in front of the current card with a single splice
+        """
+        if res:
+            self._journal.append({"op": Deck.JOURNAL_INSERT,
+                                  "position": self._pointer_position,
+                                  "length": len(self._data),
+                                  "cards": res})
+        self._data.insert_many(self._pointer_position, res)
+        self._field_index.add(res)
         if res:
             self._pointer_position = self._pointer_position - 1
+            self.flush_pointer()
 
         self._cards_left += len(res)
         return len(res)
 
     def append(self, card: Card):
-        self._data = self[:self._pointer_position] + [card] + self[self._pointer_position:]
+        self._journal.append({"op": Deck.JOURNAL_INSERT,
+                              "position": self._pointer_position,
+                              "length": len(self._data),
+                              "cards": [card]})
+        self._data.insert(self._pointer_position, card)
+        self._field_index.add((card,))
         self.move(1)
+        self.flush_pointer()
 
     def get_card(self) -> Card:
         self.move(1)
         return self.get_pointed_item()
 
+    def get_next_cards(self, n: int) -> list[Card]:
+        return self[self._pointer_position + 1:self._pointer_position + 1 + n]
+
     def get_deck(self) -> list[Card]:
-        return self._data
+        return list(self._data)
+
+    def get_journal_size(self) -> int:
+        return self._journal.mark()
 
-    def save(self):
-        with open(self.deck_path, "w", encoding="utf-8") as deck_file:
-            json.dump(self._data, deck_file, cls=FrozenDictJSONEncoder)
+    def close_journal(self) -> None:
+        """
+        Waits for the pending compaction and closes the journal.
+        Has to be called before another deck of the same file is created
+        """
+        run_compaction(self._journal.close)
+
+    def save(self, background: bool = False):
+        """
+        Writes the deck file and drops journal records that it includes
+        :param background: whether to write in a background thread
+        """
+        cards = list(self._data)
+        journal_position = self._journal.mark()
+        # deck file doesn't keep the pointer
+        pointer_record = {"op": Deck.JOURNAL_POINTER, "position": self._pointer_position}
+        self._journaled_pointer = self._pointer_position
+
+        def compact():
+            atomic_json_dump(cards, self.deck_path, cls=FrozenDictJSONEncoder)
+            self._journal.discard_until(journal_position, kept_records=(pointer_record,))
+
+        run_compaction(compact, background=background)
     
     
 class CardStatus(Enum):
@@ -214,11 +337,47 @@ class SavedDataDeck(PointerList):
     AUDIO_SRC_TYPE_LOCAL = "local"
     AUDIO_SRC_TYPE_WEB   = "web"
 
-    __slots__ = "_statistics"
+    JOURNAL_APPEND = "append"
+    JOURNAL_MOVE = "move"
 
-    def __init__(self):
-        super(SavedDataDeck, self).__init__()
+    # SKIP pages are never saved, so only positions of the other statuses are kept
+    INDEXED_STATUSES = (CardStatus.ADD, CardStatus.BURY)
+
+    __slots__ = "_statistics", "_status_positions", "_journal"
+
+    def __init__(self, journal_path: Optional[str] = None):
+        """
+        :param journal_path: where to log changes. Changes that are left there since the last
+        discard_journal call (for example, after a crash) are restored
+        """
+        super(SavedDataDeck, self).__init__(data=_SavedPages())
         self._statistics = [0, 0, 0]
+        # ascending positions of pages with the given status
+        self._status_positions: dict[CardStatus, list[int]] = {status: [] for status in SavedDataDeck.INDEXED_STATUSES}
+
+        self._journal = None
+        if journal_path is not None:
+            journal = Journal(journal_path)
+            for record in journal.read():
+                if record["op"] == SavedDataDeck.JOURNAL_APPEND:
+                    self.append(CardStatus(record["status"]), record["card_data"])
+                elif record["op"] == SavedDataDeck.JOURNAL_MOVE:
+                    self.move(record["n"])
+            self._journal = journal
+
+    def has_journaled_changes(self) -> bool:
+        return self._journal is not None and self._journal.mark() > 0
+
+    def discard_journal(self) -> None:
+        """
+        Meant to be called after the saved data has been written to disk
+        """
+        if self._journal is not None:
+            self._journal.clear()
+
+    def close_journal(self) -> None:
+        if self._journal is not None:
+            self._journal.close()
 
     def get_card_status_stats(self, status: CardStatus):
         return self._statistics[status.value]
@@ -226,53 +385,124 @@ class SavedDataDeck(PointerList):
     def append(self, status: CardStatus, card_data: dict[str, Union[str, list[str]]] = None):
         if card_data is None:
             card_data = {}
+        if self._journal is not None:
+            self._journal.append({"op": SavedDataDeck.JOURNAL_APPEND, "status": status.value, "card_data": card_data})
 
-        res = {SavedDataDeck.CARD_STATUS: status}
-        if status != CardStatus.SKIP:
+        if status == CardStatus.SKIP:
+            self._data.extend_skipped(1)
+        else:
+            res = {SavedDataDeck.CARD_STATUS: status}
             additional_data = card_data.pop(SavedDataDeck.ADDITIONAL_DATA, {})
             saving_card = Card(card_data)
             res[SavedDataDeck.CARD_DATA] = saving_card
             if additional_data:
                 res[SavedDataDeck.ADDITIONAL_DATA] = additional_data
 
-        self._data.append(FrozenDict(res))
+            self._status_positions[status].append(len(self._data))
+            self._data.append(status, FrozenDict(res))
         self._pointer_position += 1
         self._statistics[status.value] += 1
 
     def move(self, n: int) -> None:
+        if self._journal is not None:
+            self._journal.append({"op": SavedDataDeck.JOURNAL_MOVE, "n": n})
         if n < 0:
             super(SavedDataDeck, self).move(n)
-            for i in range(self.get_pointer_position(), len(self)):
-                self._statistics[self[i][SavedDataDeck.CARD_STATUS].value] -= 1
-            del self._data[self.get_pointer_position():]
+            new_length = self.get_pointer_position()
+            n_removed = len(self) - new_length
+            for status, positions in self._status_positions.items():
+                while positions and positions[-1] >= new_length:
+                    positions.pop()
+                    self._statistics[status.value] -= 1
+                    n_removed -= 1
+            # whatever is left are SKIP pages
+            self._statistics[CardStatus.SKIP.value] -= n_removed
+            self._data.truncate(new_length)
             return
-        self._data.extend((FrozenDict({SavedDataDeck.CARD_STATUS: CardStatus.SKIP}) for _ in range(n)))
+        self._data.extend_skipped(n)
         self._pointer_position = len(self)
         self._statistics[CardStatus.SKIP.value] += n
 
-    def get_audio_data(self, saving_card_status: CardStatus) -> list[FrozenDict]:
-        if not self.get_card_status_stats(saving_card_status):
-            return []
+    def iter_card_pages(self, saving_card_status: CardStatus) -> Iterator[FrozenDict]:
+        """
+        Lazily yields pages with the given status. Stops as soon as all of them are found
+        """
+        if not (remaining := self.get_card_status_stats(saving_card_status)):
+            return
+
+        if (positions := self._status_positions.get(saving_card_status)) is not None:
+            for position in positions:
+                yield self._data[position]
+            return
 
-        saving_object = []
         for card_page in self:
             if card_page[SavedDataDeck.CARD_STATUS] != saving_card_status:
                 continue
+            yield card_page
+            remaining -= 1
+            if not remaining:
+                return
+
+    def iter_audio_data(self, saving_card_status: CardStatus) -> Iterator[FrozenDict]:
+        for card_page in self.iter_card_pages(saving_card_status):
             if (additional := card_page.get(SavedDataDeck.ADDITIONAL_DATA)) is not None and \
                     (audio_data := additional.get(SavedDataDeck.AUDIO_DATA)):
-                saving_object.append(audio_data)
-        return saving_object
+                yield audio_data
+
+    def iter_card_data(self, saving_card_status: CardStatus) -> Iterator[FrozenDict]:
+        for card_page in self.iter_card_pages(saving_card_status):
+            yield card_page[SavedDataDeck.CARD_DATA]
+
+    def get_audio_data(self, saving_card_status: CardStatus) -> list[FrozenDict]:
+        return list(self.iter_audio_data(saving_card_status))
 
     def get_card_data(self, saving_card_status: CardStatus) -> list[FrozenDict]:
-        if not self.get_card_status_stats(saving_card_status):
-            return []
+        return list(self.iter_card_data(saving_card_status))
 
-        saving_object = []
-        for card_page in self:
-            if card_page[SavedDataDeck.CARD_STATUS] != saving_card_status:
-                continue
-            saving_object.append(card_page[SavedDataDeck.CARD_DATA])
-        return saving_object
+
+class _SavedPages(Sequence):
+    """
+    Column oriented storage of SavedDataDeck pages: one status byte per page
+    and payloads of saved (not skipped) pages only. All skipped pages are represented by the same page
+    """
+    __slots__ = "_statuses", "_payloads"
+
+    def __init__(self):
+        self._statuses = bytearray()
+        self._payloads: dict[int, FrozenDict] = {}
+
+    def __len__(self) -> int:
+        return len(self._statuses)
+
+    def __getitem__(self, item: Union[int, slice]):
+        if isinstance(item, slice):
+            return [self[i] for i in range(*item.indices(len(self._statuses)))]
+        if item < 0:
+            item += len(self._statuses)
+        if not 0 <= item < len(self._statuses):
+            raise IndexError("saved pages index out of range")
+        return self._payloads.get(item, _SKIPPED_PAGE)
+
+    def __iter__(self) -> Iterator[FrozenDict]:
+        skip_status = CardStatus.SKIP.value
+        for i, status in enumerate(self._statuses):
+            yield _SKIPPED_PAGE if status == skip_status else self._payloads[i]
+
+    def append(self, status: CardStatus, page: FrozenDict) -> None:
+        self._payloads[len(self._statuses)] = page
+        self._statuses.append(status.value)
+
+    def extend_skipped(self, n: int) -> None:
+        self._statuses.extend(bytes((CardStatus.SKIP.value,)) * n)
+
+    def truncate(self, length: int) -> None:
+        # payloads are added in ascending order of positions, so the last added one has the largest position
+        while self._payloads and next(reversed(self._payloads)) >= length:
+            self._payloads.popitem()
+        del self._statuses[length:]
+
+
+_SKIPPED_PAGE = FrozenDict({SavedDataDeck.CARD_STATUS: CardStatus.SKIP})
 
 
 class SentenceFetcher:
@@ -0,0 +1,73 @@
+import hashlib
+from threading import Lock
+from typing import Optional
+
+from app_utils.storages import DiskLRUStore
+
+
+class ImageCache:
+    """
+    Content addressed cache of downloaded images and their thumbnails.
+    Urls point to digests of images, so the same image found under several urls is stored once.
+    Thumbnails are kept per image and per thumbnail size limits
+    """
+    __slots__ = "_store_path", "_max_size", "_store", "_store_lock"
+
+    def __init__(self, store_path: str, max_size: int):
+        self._store_path = store_path
+        self._max_size = max_size
+        self._store: Optional[DiskLRUStore] = None
+        self._store_lock = Lock()
+
+    def _get_store(self) -> DiskLRUStore:
+        # opened on first use so that starting the app doesn't touch the disk
+        with self._store_lock:
+            if self._store is None:
+                self._store = DiskLRUStore(self._store_path, self._max_size)
+            return self._store
+
+    def set_max_size(self, max_size: int) -> None:
+        with self._store_lock:
+            self._max_size = max_size
+            if self._store is not None:
+                self._store.set_max_size(max_size)
+
+    @staticmethod
+    def _get_thumbnail_key(digest: str, width: Optional[int], height: Optional[int]) -> str:
+        return f"thumbnail:{digest}:{width}x{height}"
+
+    def _get_digest(self, url: str) -> Optional[str]:
+        if (cached := self._get_store().get(f"url:{url}")) is None:
+            return None
+        return cached[0].decode("UTF-8")
+
+    def get_image(self, url: str) -> Optional[bytes]:
+        """
+        :return: downloaded image bytes
+        """
+        if (digest := self._get_digest(url)) is None or \
+                (cached := self._get_store().get(f"image:{digest}")) is None:
+            return None
+        return cached[0]
+
+    def put_image(self, url: str, content: bytes) -> None:
+        digest = hashlib.sha256(content).hexdigest()
+        store = self._get_store()
+        store.put(f"image:{digest}", content)
+        store.put(f"url:{url}", digest.encode("UTF-8"))
+
+    def get_thumbnail(self, url: str, width: Optional[int], height: Optional[int]) -> Optional[bytes]:
+        """
+        :return: encoded thumbnail of the url's image made with given size limits
+        """
+        if (digest := self._get_digest(url)) is None or \
+                (cached := self._get_store().get(self._get_thumbnail_key(digest, width, height))) is None:
+            return None
+        return cached[0]
+
+    def put_thumbnail(self, url: str, width: Optional[int], height: Optional[int], thumbnail: bytes) -> None:
+        """
+        Has to be called after put_image of the same url
+        """
+        if (digest := self._get_digest(url)) is not None:
+            self._get_store().put(self._get_thumbnail_key(digest, width, height), thumbnail)
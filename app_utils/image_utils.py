@@ -6,20 +6,22 @@ from concurrent.futures import ThreadPoolExecutor
 from enum import IntEnum
 from functools import partial
 from io import BytesIO
+from queue import Empty, SimpleQueue
 from tkinter import Entry, Button
 from tkinter import Frame
 from tkinter import Toplevel
 from tkinter import messagebox
-from typing import Callable, Generator, Any
+from typing import Callable, Generator, Any, Optional, Union
 
-import requests
 from PIL import Image, ImageTk
 from requests.exceptions import RequestException, ConnectTimeout
 from tkinterdnd2 import DND_FILES, DND_TEXT
 
+from app_utils.image_cache import ImageCache
 from app_utils.widgets import ScrolledFrame
 from consts.paths import SYSTEM
 from plugins_loading.containers import LanguagePackageContainer
+from plugins_management.http_sessions import POOL_SIZE, session_registry
 
 if SYSTEM == "Linux":
     import gi
@@ -50,6 +52,16 @@ class _UrlDeque(UserList):
             self.appendleft(collection[i])
 
 
+class _FetchBatch:
+    """
+    Retries budget shared by fetches of one batch
+    """
+    __slots__ = "n_retries"
+
+    def __init__(self, n_retries: int):
+        self.n_retries = n_retries
+
+
 class ImageSearch(Toplevel):
     class StatusCodes(IntEnum):
         NORMAL = 0
@@ -69,6 +81,7 @@ class ImageSearch(Toplevel):
         init_images: custom images to be displayed
         headers: request headers
         timeout: request timeout
+        image_cache: ImageCache that is looked up before downloading
         show_image_width: maximum image display width
         show_image_height: maximum image display height
         n_images_in_row:
@@ -104,6 +117,7 @@ class ImageSearch(Toplevel):
 
         self._headers = kwargs.get("headers")
         self._timeout = kwargs.get("timeout", 1)
+        self._image_cache: Optional[ImageCache] = kwargs.get("image_cache")
         self._max_request_tries = kwargs.get("max_request_tries", 5)
 
         self._n_images_in_row = kwargs.get("n_images_in_row", 3)
@@ -113,9 +127,17 @@ class ImageSearch(Toplevel):
         self.optimal_visual_width = kwargs.get("show_image_width")
         self.optimal_visual_height = kwargs.get("show_image_height")
 
-        self._pool: ThreadPoolExecutor = ThreadPoolExecutor()
-
-        self.saving_images: list[Image] = []
+        self._pool: ThreadPoolExecutor = ThreadPoolExecutor(max_workers=POOL_SIZE)
+        # workers put (generation, batch, status, url, thumbnail, content) here. Results of older
+        # generations (searches that were restarted) are dropped
+        self._results: SimpleQueue = SimpleQueue()
+        self._generation = 0
+        self._n_pending_fetches = 0
+        self._poll_job = None
+        self.poll_interval = 50
+
+        # fetched images are kept as downloaded (compressed) bytes and are decoded by get_saving_image
+        self.saving_images: list[Union[bytes, Image.Image]] = []
         self.images_source: list[str] = []
         self.working_state: list[bool] = []  # indices of picked buttons
         self.button_list: list[Button] = []
@@ -221,6 +243,8 @@ class ImageSearch(Toplevel):
         self._start_url_generator()
         self._inner_frame = self._sf.display_widget(partial(Frame, **self._frame_params))
         self._img_urls.clear()
+        self._generation += 1
+        self._n_pending_fetches = 0
 
         left_indent = 0
         for i in range(len(self.working_state)):
@@ -255,6 +279,11 @@ class ImageSearch(Toplevel):
     def destroy(self):
         if self._on_closing_action is not None:
             self._on_closing_action(self)
+        self._generation += 1
+        self._pool.shutdown(wait=False, cancel_futures=True)
+        if self._poll_job is not None:
+            self.after_cancel(self._poll_job)
+            self._poll_job = None
         super(ImageSearch, self).destroy()
 
     def _resize_window(self):
@@ -278,6 +307,35 @@ class ImageSearch(Toplevel):
                                                  Image.ANTIALIAS)
         return processed_img
 
+    @staticmethod
+    def make_thumbnail(content: bytes, width: int = None, height: int = None) -> Image:
+        """
+        Same as preprocess_image(Image.open(BytesIO(content)), width, height), but JPEGs are decoded
+        at a reduced scale and other formats are reduced by an integer factor before resampling
+        """
+        img = Image.open(BytesIO(content))
+        thumbnail_width, thumbnail_height = img.size
+        if width is not None and thumbnail_width > width:
+            thumbnail_height = int(thumbnail_height * width / thumbnail_width)
+            thumbnail_width = width
+        if height is not None and thumbnail_height > height:
+            thumbnail_width = int(thumbnail_width * height / thumbnail_height)
+            thumbnail_height = height
+
+        if (thumbnail_width, thumbnail_height) == img.size:
+            img.load()
+            return img
+        img.draft(None, (thumbnail_width, thumbnail_height))
+        return img.resize((thumbnail_width, thumbnail_height), Image.ANTIALIAS, reducing_gap=3.0)
+
+    def get_saving_image(self, index: int) -> Image:
+        """
+        Decodes index-th image at full size
+        """
+        if isinstance((img := self.saving_images[index]), bytes):
+            return Image.open(BytesIO(img))
+        return img
+
     def fetch_image(self, url):
         """
         fetches image from web
@@ -285,7 +343,7 @@ class ImageSearch(Toplevel):
         :return: status, button_img, img
         """
         try:
-            response = requests.get(url, headers=self._headers, timeout=self._timeout)
+            response = session_registry.get(url, headers=self._headers, timeout=self._timeout)
             response.raise_for_status()
             content = response.content
             return ImageSearch.StatusCodes.NORMAL, content, url
@@ -294,20 +352,66 @@ class ImageSearch(Toplevel):
         except RequestException:
             return ImageSearch.StatusCodes.NON_RETRIABLE_FETCHING_ERROR, None, None
 
-    def _schedule_batch_fetching(self, url_batch: list[str]):
-        image_fetch_tasks = []
-        for url in url_batch:
-            image_fetch_tasks.append(self._pool.submit(self.fetch_image, url))
-        return image_fetch_tasks
-
     def process_bin_data(self, content=None):
+        """
+        Makes image thumbnail. Safe to call from worker threads
+        :return: status, thumbnail
+        """
+        try:
+            thumbnail = self.make_thumbnail(content, width=self.optimal_visual_width, height=self.optimal_visual_height)
+            return ImageSearch.StatusCodes.NORMAL, thumbnail
+        except (IOError, UnicodeError, Image.DecompressionBombError):
+            return ImageSearch.StatusCodes.IMAGE_PROCESSING_ERROR, None
+
+    def _cache_thumbnail(self, url: str, thumbnail: Image) -> None:
+        buffer = BytesIO()
         try:
-            img = Image.open(BytesIO(content))
-            button_img = ImageTk.PhotoImage(
-                self.preprocess_image(img, width=self.optimal_visual_width, height=self.optimal_visual_height))
-            return ImageSearch.StatusCodes.NORMAL, button_img, img
-        except (IOError, UnicodeError):
-            return ImageSearch.StatusCodes.IMAGE_PROCESSING_ERROR, None, None
+            thumbnail.save(buffer, format="PNG")
+        except (IOError, ValueError):
+            # modes that PNG can't hold (like CMYK) are left uncached
+            return
+        self._image_cache.put_thumbnail(url, self.optimal_visual_width, self.optimal_visual_height, buffer.getvalue())
+
+    def _get_cached_thumbnail(self, url: str, content: bytes):
+        """
+        :return: status, thumbnail
+        """
+        if (encoded := self._image_cache.get_thumbnail(url, self.optimal_visual_width,
+                                                       self.optimal_visual_height)) is not None:
+            try:
+                thumbnail = Image.open(BytesIO(encoded))
+                thumbnail.load()
+                return ImageSearch.StatusCodes.NORMAL, thumbnail
+            except (IOError, UnicodeError):
+                pass
+
+        status, thumbnail = self.process_bin_data(content)
+        if status == ImageSearch.StatusCodes.NORMAL:
+            self._cache_thumbnail(url, thumbnail)
+        return status, thumbnail
+
+    def _fetch_thumbnail(self, url: str, generation: int, batch: _FetchBatch) -> None:
+        """
+        Worker part of the pipeline: cache lookup or download, decoding and thumbnail generation
+        """
+        if self._image_cache is not None and (content := self._image_cache.get_image(url)) is not None:
+            status, thumbnail = self._get_cached_thumbnail(url, content)
+        else:
+            thumbnail = None
+            status, content, _ = self.fetch_image(url)
+            if status == ImageSearch.StatusCodes.NORMAL:
+                status, thumbnail = self.process_bin_data(content)
+                # only images that could be decoded are cached
+                if status == ImageSearch.StatusCodes.NORMAL and self._image_cache is not None:
+                    self._image_cache.put_image(url, content)
+                    self._cache_thumbnail(url, thumbnail)
+        self._results.put((generation, batch, status, url, thumbnail, content))
+
+    def _submit_fetching(self, url: str, batch: _FetchBatch) -> None:
+        self._n_pending_fetches += 1
+        self._pool.submit(self._fetch_thumbnail, url, self._generation, batch)
+        if self._poll_job is None:
+            self._poll_job = self.after(self.poll_interval, self._poll_results)
 
     def _choose_picture(self, button_index):
         self.working_state[button_index] = not self.working_state[button_index]
@@ -328,45 +432,60 @@ class ImageSearch(Toplevel):
         self._inner_frame.update()
         self._resize_window()
 
+    def _add_fetching_to_queue(self, batch: _FetchBatch) -> None:
+        """
+        Replaces a failed fetch of the batch with the next url. Replacement runs alongside other fetches
+        """
+        self._generate_urls(1)
+        if len(self._img_urls) and batch.n_retries < self._max_request_tries:
+            self._submit_fetching(self._img_urls.popleft()[0], batch)
+            batch.n_retries += 1
+
+    def _poll_results(self) -> None:
+        """
+        UI part of the pipeline: places thumbnails in the order their fetches finish
+        """
+        while True:
+            try:
+                generation, batch, status, url, thumbnail, content = self._results.get_nowait()
+            except Empty:
+                break
+            if generation != self._generation:
+                continue
+            self._n_pending_fetches -= 1
+
+            if status == ImageSearch.StatusCodes.NORMAL:
+                self.saving_images.append(content)
+                self.images_source.append(url)
+                # PhotoImage has to be created in the thread of the Tk interpreter
+                self._place_buttons([ImageTk.PhotoImage(thumbnail)])
+            elif status == ImageSearch.StatusCodes.RETRIABLE_FETCHING_ERROR:
+                self._img_urls.append(url)
+                self._add_fetching_to_queue(batch)
+            else:
+                self._add_fetching_to_queue(batch)
+
+        self._poll_job = self.after(self.poll_interval, self._poll_results) if self._n_pending_fetches else None
+
     def _process_batch(self, batch_size, n_retries=0):
         """
+        Schedules fetching of batch_size images. Returns right away, images are placed by _poll_results
         :param batch_size: how many images to place
         :param n_retries: (if some error occurred) replace "bad" image with the new one and tries to fetch it.
         :return:
         """
-        def add_fetching_to_queue():
-            nonlocal n_retries
-            self._generate_urls(1)
-            if len(self._img_urls) and n_retries < self._max_request_tries:
-                image_fetching_futures.append(self._pool.submit(self.fetch_image, self._img_urls.popleft()[0]))
-                n_retries += 1
-
         self._generate_urls(batch_size)
-        url_batch = self._img_urls.popleft(batch_size)
-        button_images_batch = []
-        image_fetching_futures = self._schedule_batch_fetching(url_batch)
-        while image_fetching_futures:
-            fetching_status, content, url = image_fetching_futures.pop(0).result()
-            if fetching_status == ImageSearch.StatusCodes.NORMAL:
-                processing_status, button_img, img = self.process_bin_data(content)
-                if processing_status == ImageSearch.StatusCodes.NORMAL:
-                    button_images_batch.append(button_img)
-                    self.saving_images.append(img)
-                    self.images_source.append(url)
-                else:
-                    add_fetching_to_queue()
-            elif fetching_status == ImageSearch.StatusCodes.RETRIABLE_FETCHING_ERROR:
-                self._img_urls.append(url)
-                add_fetching_to_queue()
-            else:
-                add_fetching_to_queue()
-        self._place_buttons(button_images_batch)
+        batch = _FetchBatch(n_retries)
+        for url in self._img_urls.popleft(batch_size):
+            self._submit_fetching(url, batch)
 
     def _show_more(self):
         self.update()
         self._show_more_button["state"] = "normal"
         while True:
-            self._process_batch(self._n_images_per_cycle - len(self.working_state) % self._n_images_in_row)
+            # images that are still being fetched will take their places in the grid
+            n_placed = len(self.working_state) + self._n_pending_fetches
+            self._process_batch(self._n_images_per_cycle - n_placed % self._n_images_in_row)
             if self._scrapper_stop_flag and not len(self._img_urls):
                 break
             yield
@@ -434,7 +553,7 @@ if __name__ == "__main__":
     def save_on_closing(instance: ImageSearch):
         for i in range(len(instance.working_state)):
             if instance.working_state[i]:
-                instance.saving_images[i].save(f"./{i}.png")
+                instance.get_saving_image(i).save(f"./{i}.png")
     
     def get_chosen_urls(instance: ImageSearch):
         res = []
@@ -0,0 +1,133 @@
+import json
+import os
+from concurrent.futures import Future, ThreadPoolExecutor
+from threading import Lock
+from typing import Any, Callable, Iterable, Optional
+
+from app_utils.storages import FrozenDictJSONEncoder
+
+JOURNAL_EXTENSION = ".journal"
+
+# snapshots are written one at a time, so that two compactions never write the same file simultaneously
+_compaction_pool = ThreadPoolExecutor(max_workers=1)
+
+
+def get_journal_path(path: str, suffix: str = "") -> str:
+    return f"{path}.{suffix}{JOURNAL_EXTENSION}" if suffix else f"{path}{JOURNAL_EXTENSION}"
+
+
+def atomic_json_dump(data: Any, path: str, **kwargs) -> None:
+    """
+    Writes data to a temporary file and renames it over the path,
+    so that the path holds either the old or the new data even if writing is interrupted
+    """
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "w", encoding="UTF-8") as f:
+        json.dump(data, f, **kwargs)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp_path, path)
+
+
+def atomic_write_text(text: str, path: str) -> None:
+    """
+    Same as atomic_json_dump, but for already serialized data
+    """
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "w", encoding="UTF-8") as f:
+        f.write(text)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp_path, path)
+
+
+def run_compaction(compaction: Callable[[], None], background: bool = False) -> Optional[Future]:
+    """
+    :param background: whether to return right away instead of waiting for the compaction to finish
+    """
+    task = _compaction_pool.submit(compaction)
+    if background:
+        return task
+    task.result()
+    return None
+
+
+class Journal:
+    """
+    Thread safe append-only log of JSON records (one record per line).
+    The file is created on the first append
+    """
+    __slots__ = "path", "_file", "_lock"
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = None
+        self._lock = Lock()
+
+    def append(self, record: dict) -> None:
+        line = json.dumps(record, ensure_ascii=False, cls=FrozenDictJSONEncoder) + "\n"
+        with self._lock:
+            if self._file is None:
+                self._file = open(self.path, "a", encoding="UTF-8")
+            self._file.write(line)
+            self._file.flush()
+
+    def read(self) -> list[dict]:
+        """
+        Skips the last record if it wasn't written completely
+        """
+        if not os.path.isfile(self.path):
+            return []
+
+        records = []
+        with self._lock, open(self.path, "r", encoding="UTF-8") as f:
+            for line in f:
+                try:
+                    records.append(json.loads(line))
+                except json.JSONDecodeError:
+                    break
+        return records
+
+    def mark(self) -> int:
+        """
+        :return: position that separates already written records from the future ones
+        """
+        with self._lock:
+            return os.path.getsize(self.path) if os.path.isfile(self.path) else 0
+
+    def discard_until(self, position: int, kept_records: Iterable[dict] = ()) -> None:
+        """
+        Drops records written before position (returned by mark)
+        :param kept_records: records to put in place of the dropped ones
+        """
+        kept = "".join(json.dumps(record, ensure_ascii=False, cls=FrozenDictJSONEncoder) + "\n"
+                       for record in kept_records).encode("UTF-8")
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+            remaining = b""
+            if os.path.isfile(self.path):
+                with open(self.path, "rb") as f:
+                    f.seek(position)
+                    remaining = f.read()
+            if not kept and not remaining:
+                if os.path.isfile(self.path):
+                    os.remove(self.path)
+                return
+
+            temp_path = f"{self.path}.tmp"
+            with open(temp_path, "wb") as f:
+                f.write(kept)
+                f.write(remaining)
+            os.replace(temp_path, self.path)
+
+    def clear(self) -> None:
+        self.discard_until(self.mark())
+
+    def close(self) -> None:
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
@@ -0,0 +1,212 @@
+import json
+import mmap
+import os
+import struct
+from collections.abc import Mapping, Sequence
+from typing import Iterable, Iterator, Union
+
+# Binary layout (all integers are little-endian):
+#   header:        magic (8 bytes), format version (u32), number of entries n (u32)
+#   offsets table: n + 1 rows of (key offset, payload offset) (u64, u64); the last row marks the end of both blocks
+#   key block:     UTF-8 encoded headwords in the order of the JSON dictionary, each one is terminated by b"\0"
+#   payloads:      compact UTF-8 JSON of each headword's data in the same order as keys
+_MAGIC = b"D2ADICT\0"
+_VERSION = 1
+_HEADER = struct.Struct("<8sII")
+_OFFSETS_ROW = struct.Struct("<QQ")
+
+BINARY_DICTIONARY_EXTENSION = ".bin"
+
+
+class DictionaryFormatError(Exception):
+    pass
+
+
+def get_binary_dictionary_path(json_dictionary_path: str) -> str:
+    return f"{os.path.splitext(json_dictionary_path)[0]}{BINARY_DICTIONARY_EXTENSION}"
+
+
+def compile_dictionary(entries: Iterable[tuple[str, dict]], binary_path: str) -> None:
+    """
+    :param entries: (headword, headword data) pairs in the format of local JSON dictionaries
+    :param binary_path: where to save compiled dictionary
+    """
+    encoder = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"))
+    # file order is kept, so that lookups return cards in the same order as the JSON dictionary does
+    entries = list(entries)
+    n_entries = len(entries)
+
+    keys = [word.encode("UTF-8") + b"\0" for word, _ in entries]
+    payloads = [encoder.encode(data).encode("UTF-8") for _, data in entries]
+
+    offsets = bytearray()
+    key_offset = _HEADER.size + _OFFSETS_ROW.size * (n_entries + 1)
+    payload_offset = key_offset + sum(len(key) for key in keys)
+    for key, payload in zip(keys, payloads):
+        offsets += _OFFSETS_ROW.pack(key_offset, payload_offset)
+        key_offset += len(key)
+        payload_offset += len(payload)
+    offsets += _OFFSETS_ROW.pack(key_offset, payload_offset)
+
+    temp_path = f"{binary_path}.tmp"
+    with open(temp_path, "wb") as f:
+        f.write(_HEADER.pack(_MAGIC, _VERSION, n_entries))
+        f.write(offsets)
+        f.writelines(keys)
+        f.writelines(payloads)
+        f.flush()
+        os.fsync(f.fileno())
+    # a partially written file never gets the final name (and thus a fresh modification time)
+    os.replace(temp_path, binary_path)
+
+
+class _LazyPayload(Mapping):
+    __slots__ = "_buffer", "_start", "_end", "_data"
+
+    def __init__(self, buffer: mmap.mmap, start: int, end: int):
+        self._buffer = buffer
+        self._start = start
+        self._end = end
+        self._data = None
+
+    def _decode(self) -> dict:
+        if self._data is None:
+            self._data = json.loads(self._buffer[self._start:self._end])
+        return self._data
+
+    def __getitem__(self, key):
+        return self._decode()[key]
+
+    def __iter__(self):
+        return iter(self._decode())
+
+    def __len__(self):
+        return len(self._decode())
+
+    def __repr__(self):
+        return f"LazyPayload {self._decode()}"
+
+
+class BinaryDictionary(Sequence):
+    """
+    Memory mapped reader of compiled local dictionaries.
+    Entries are (headword, headword data) pairs. Headword data is decoded on first access
+    """
+    __slots__ = "_buffer", "_n_entries"
+
+    def __init__(self, binary_path: str):
+        with open(binary_path, "rb") as f:
+            self._buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        try:
+            self._check_format(binary_path)
+        except DictionaryFormatError:
+            # the file is going to be replaced by a recompiled one, which is impossible on Windows while it is mapped
+            self._buffer.close()
+            raise
+
+    def _check_format(self, binary_path: str) -> None:
+        if len(self._buffer) < _HEADER.size:
+            raise DictionaryFormatError(f"\"{binary_path}\" is not a compiled dictionary")
+        magic, version, self._n_entries = _HEADER.unpack_from(self._buffer, 0)
+        if magic != _MAGIC or version != _VERSION:
+            raise DictionaryFormatError(f"\"{binary_path}\" is not a compiled dictionary of version {_VERSION}")
+        if len(self._buffer) < _HEADER.size + _OFFSETS_ROW.size * (self._n_entries + 1) or \
+                self._offsets(self._n_entries)[1] != len(self._buffer):
+            raise DictionaryFormatError(f"\"{binary_path}\" is truncated")
+
+    def _offsets(self, index: int) -> tuple[int, int]:
+        return _OFFSETS_ROW.unpack_from(self._buffer, _HEADER.size + _OFFSETS_ROW.size * index)
+
+    def __len__(self) -> int:
+        return self._n_entries
+
+    def __getitem__(self, index: Union[int, slice]):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._n_entries))]
+
+        if index < 0:
+            index += self._n_entries
+        if not 0 <= index < self._n_entries:
+            raise IndexError("dictionary index out of range")
+
+        key_start, payload_start = self._offsets(index)
+        key_end, payload_end = self._offsets(index + 1)
+        return self._buffer[key_start:key_end - 1].decode("UTF-8"), \
+               _LazyPayload(self._buffer, payload_start, payload_end)
+
+    def headwords(self) -> list[str]:
+        if not self._n_entries:
+            return []
+        keys_start, _ = self._offsets(0)
+        keys_end, _ = self._offsets(self._n_entries)
+        return self._buffer[keys_start:keys_end - 1].decode("UTF-8").split("\0")
+
+    def __iter__(self) -> Iterator[tuple[str, _LazyPayload]]:
+        for i in range(self._n_entries):
+            yield self[i]
+
+
+def load_local_dictionary(json_dictionary_path: str) -> Sequence[tuple[str, Mapping]]:
+    """
+    Opens compiled version of the dictionary if it is up to date. Otherwise, loads JSON dictionary
+    and tries to compile it for the next launches
+    """
+    binary_path = get_binary_dictionary_path(json_dictionary_path)
+    json_exists = os.path.isfile(json_dictionary_path)
+    if os.path.isfile(binary_path) and \
+            (not json_exists or os.path.getmtime(binary_path) >= os.path.getmtime(json_dictionary_path)):
+        try:
+            return BinaryDictionary(binary_path)
+        # empty (mmap raises ValueError), truncated or outdated compiled file
+        except (OSError, ValueError, DictionaryFormatError):
+            if not json_exists:
+                raise
+
+    if not json_exists:
+        raise Exception(f"Local dictionary with path \"{json_dictionary_path}\" doesn't exist")
+
+    with open(json_dictionary_path, "r", encoding="UTF-8") as f:
+        local_dictionary: list[tuple[str, dict]] = json.load(f)
+    try:
+        compile_dictionary(local_dictionary, binary_path)
+    except OSError:
+        pass
+    return local_dictionary
+
+
+def main():
+    import sys
+    import time
+    import tracemalloc
+
+    if len(sys.argv) != 2:
+        print("Usage: python -m app_utils.local_dictionary <JSON dictionary path>")
+        return
+
+    json_path = sys.argv[1]
+    binary_path = get_binary_dictionary_path(json_path)
+    with open(json_path, "r", encoding="UTF-8") as f:
+        compile_dictionary(json.load(f), binary_path)
+
+    def measure(loader):
+        tracemalloc.start()
+        start = time.perf_counter()
+        res = loader()
+        headwords = res.headwords() if isinstance(res, BinaryDictionary) else [word for word, _ in res]
+        elapsed = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        return len(headwords), elapsed, peak
+
+    def load_json():
+        with open(json_path, "r", encoding="UTF-8") as f:
+            return json.load(f)
+
+    for name, loader in (("JSON", load_json), ("binary", lambda: BinaryDictionary(binary_path))):
+        n_entries, elapsed, peak = measure(loader)
+        print(f"{name}: {n_entries} entries, {elapsed:.3f}s, peak memory {peak / 2 ** 20:.1f}MiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Hashable, Iterable, Optional
+
+from plugins_management.parsers_return_types import ImageGenerator, SentenceGenerator
+
+
+class Prefetcher:
+    """
+    Runs slow (network bound) calls ahead of time in worker threads.
+    All methods are meant to be called from a single (UI) thread
+    """
+    __slots__ = "_pool", "_tasks"
+
+    def __init__(self, max_workers: int = 4):
+        self._pool = ThreadPoolExecutor(max_workers=max_workers)
+        self._tasks: dict[Hashable, Future] = {}
+
+    def schedule(self, key: Hashable, function: Callable, *args) -> None:
+        if key not in self._tasks:
+            self._tasks[key] = self._pool.submit(function, *args)
+
+    def get(self, key: Hashable, function: Callable, *args) -> Any:
+        """
+        Returns result of the scheduled task. Falls back to calling function in place if nothing was scheduled
+        """
+        if (task := self._tasks.get(key)) is not None:
+            return task.result()
+        return function(*args)
+
+    def pop(self, key: Hashable, function: Callable, *args) -> Any:
+        """
+        Same as get, but removes the task. Meant for results that can be consumed only once, like generators
+        """
+        if (task := self._tasks.pop(key, None)) is not None:
+            return task.result()
+        return function(*args)
+
+    def retain(self, keys: Iterable[Hashable]) -> None:
+        """
+        Drops every task whose key is not in keys
+        """
+        keys = set(keys)
+        for key in [key for key in self._tasks if key not in keys]:
+            self._tasks.pop(key).cancel()
+
+    def clear(self) -> None:
+        self.retain(())
+
+    def shutdown(self) -> None:
+        self.clear()
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+
+PrimedSentences = tuple[Optional[tuple[list[str], str]], SentenceGenerator]
+
+
+def prime_sentence_generator(sentence_getter: Callable[[str, int], SentenceGenerator],
+                             word: str, size: int) -> PrimedSentences:
+    """
+    Fetches the first sentence batch. The rest of batches are left inside returned generator
+    """
+    generator = sentence_getter(word, size)
+    return next(generator, None), generator
+
+
+def resume_sentence_generator(primed: PrimedSentences) -> SentenceGenerator:
+    first_batch, generator = primed
+    if first_batch is None:
+        return
+    yield first_batch
+    yield from generator
+
+
+PrimedImages = tuple[Optional[tuple[list[str], str]], ImageGenerator]
+
+
+def prime_image_generator(image_getter: Callable[[str], ImageGenerator], word: str) -> PrimedImages:
+    """
+    Does the first (fetching) step of image urls generator.
+    If the generator finishes on this step, its return value is returned instead of the generator
+    """
+    generator = image_getter(word)
+    try:
+        next(generator)
+    except StopIteration as exception:
+        return exception.value, generator
+    return None, generator
+
+
+def resume_image_generator(primed: PrimedImages) -> ImageGenerator:
+    return_value, generator = primed
+    if return_value is not None:
+        return return_value
+
+    batch_size = yield
+    while True:
+        try:
+            url_batch = generator.send(batch_size)
+        except StopIteration as exception:
+            return exception.value
+        batch_size = yield url_batch
@@ -199,6 +199,7 @@ Evaluation precedence:
 
 import copy
 import itertools
+import operator as operator_module
 import re
 from abc import ABC, abstractmethod
 from collections.abc import Mapping
@@ -242,11 +243,43 @@ class TreeBuildingError(ParsingException):
     pass
 
 
+class ResultKind(Enum):
+    SCALAR = auto()  # type: ignore
+    LIST = auto()  # type: ignore
+    UNKNOWN = auto()  # type: ignore
+
+
+# (candidate card ids or None for every card, whether every candidate is known to pass the filter)
+Plan = tuple[Optional[set[int]], bool]
+NO_PLAN: Plan = (None, False)
+
+
 class Computable(ABC):
     @abstractmethod
     def compute(self, mapping: Mapping):
         pass
 
+    @abstractmethod
+    def compile(self) -> Callable[[Mapping], Any]:
+        """
+        Returns a function that is equivalent to compute, but with all the
+        work that doesn't depend on the mapping done ahead of time
+        """
+        pass
+
+    def result_kind(self) -> ResultKind:
+        """
+        Whether compute returns a list-like (list, tuple or generator) value, which logic operators
+        map element-wise, or a scalar one
+        """
+        return ResultKind.UNKNOWN
+
+    def plan(self, index: "FieldIndex") -> Plan:
+        """
+        Narrows down cards whose compute result is truthy using field index
+        """
+        return NO_PLAN
+
 
 KEYWORDS = frozenset(("in", ))
 UNARY_LOGIC = frozenset(("not", ))
@@ -257,25 +290,28 @@ BIN_LOGIC_PRECEDENCE = (BIN_LOGIC_HIGH, BIN_LOGIC_MID, BIN_LOGIC_LOW)
 BIN_LOGIC_SET = reduce(lambda x, y: x | y, BIN_LOGIC_PRECEDENCE)
 
 
-def logic_factory(operator: str) -> Union[Callable[[Union[Iterable[Computable], Computable],
-                                                   Mapping], bool],
-                                          Callable[[Union[Iterable[Computable], Computable],
-                                                   Union[Iterable[Computable], Computable],
-                                                   Mapping], bool]]:
+Evaluator = Callable[[Mapping], Any]
+
+
+def logic_factory(operator: str) -> Union[Callable[[Evaluator, Mapping], Any],
+                                          Callable[[Evaluator, Evaluator, Mapping], Any]]:
+    """
+    Operands are either Computable.compute methods or compiled Computables
+    """
     list_like_types = (list, tuple, Generator)
 
-    def operator_not(x: Union[Iterable[Computable], Computable],
-                      mapping: Mapping):
-        x_computed = x.compute(mapping)
+    def operator_not(x: Evaluator,
+                     mapping: Mapping):
+        x_computed = x(mapping)
         if isinstance(x_computed, list_like_types):
-            return (not item for item in x)
+            return (not item for item in x_computed)
         return not x_computed
 
-    def operator_and(x: Union[Iterable[Computable], Computable],
-                     y: Union[Iterable[Computable], Computable],
+    def operator_and(x: Evaluator,
+                     y: Evaluator,
                      mapping: Mapping):
-        x_computed = x.compute(mapping)
-        y_computed = y.compute(mapping)
+        x_computed = x(mapping)
+        y_computed = y(mapping)
 
         if isinstance(x_computed, list_like_types):
             if isinstance(y_computed, list_like_types):
@@ -293,11 +329,11 @@ def logic_factory(operator: str) -> Union[Callable[[Union[Iterable[Computable],
             return False
         return y_computed
 
-    def operator_or(x: Union[Iterable[Computable], Computable],
-                    y: Union[Iterable[Computable], Computable],
+    def operator_or(x: Evaluator,
+                    y: Evaluator,
                     mapping: Mapping):
-        x_computed = x.compute(mapping)
-        y_computed = y.compute(mapping)
+        x_computed = x(mapping)
+        y_computed = y(mapping)
 
         if isinstance(x_computed, list_like_types):
             if isinstance(y_computed, list_like_types):
@@ -317,12 +353,12 @@ def logic_factory(operator: str) -> Union[Callable[[Union[Iterable[Computable],
         return y_computed
 
 
-    def bin_op_template(x: Union[Iterable[Computable], Computable],
-                        y: Union[Iterable[Computable], Computable],
+    def bin_op_template(x: Evaluator,
+                        y: Evaluator,
                         mapping: Mapping,
                         _op: Callable[[Any, Any], bool]):
-        x_computed = x.compute(mapping)
-        y_computed = y.compute(mapping)
+        x_computed = x(mapping)
+        y_computed = y(mapping)
 
         if isinstance(x_computed, list_like_types):
             if isinstance(y_computed, list_like_types):
@@ -341,17 +377,17 @@ def logic_factory(operator: str) -> Union[Callable[[Union[Iterable[Computable],
     elif operator == "or":
         return operator_or
     elif operator == "<":
-        return partial(bin_op_template, _op=lambda x, y: x < y)  # type: ignore
+        return partial(bin_op_template, _op=operator_module.lt)  # type: ignore
     elif operator == "<=":
-        return partial(bin_op_template, _op=lambda x, y: x <= y) # type: ignore
+        return partial(bin_op_template, _op=operator_module.le)  # type: ignore
     elif operator == ">":
-        return partial(bin_op_template, _op=lambda x, y: x > y)  # type: ignore
+        return partial(bin_op_template, _op=operator_module.gt)  # type: ignore
     elif operator == ">=":
-        return partial(bin_op_template, _op=lambda x, y: x >= y)  # type: ignore
+        return partial(bin_op_template, _op=operator_module.ge)  # type: ignore
     elif operator == "==":
-        return partial(bin_op_template, _op=lambda x, y: x == y)  # type: ignore
+        return partial(bin_op_template, _op=operator_module.eq)  # type: ignore
     elif operator == "!=":
-        return partial(bin_op_template, _op=lambda x, y: x != y)  # type: ignore
+        return partial(bin_op_template, _op=operator_module.ne)  # type: ignore
     raise LogicOperatorError(f"Unknown operator: {operator}")
     
 
@@ -400,8 +436,8 @@ def keyword_factory(keyword_name: str) -> Callable[[Any], int]:
     if keyword_name == "in":
         def field_contains(collection: Iterable, search_pattern: re.Pattern):
             if isinstance(collection, str):
-                return re.search(search_pattern, collection) is not None
-            return any((re.search(search_pattern, str(item)) is not None for item in collection))
+                return search_pattern.search(collection) is not None
+            return any((search_pattern.search(str(item)) is not None for item in collection))
         return field_contains
     raise WrongKeywordError(f"Unknown keyword: {keyword_name}")
 
@@ -508,6 +544,31 @@ class Token(Computable):
             return float(self.value)
         return FieldDataGetter(self.value).compute(mapping)
 
+    def compile(self) -> Callable[[Mapping], Any]:
+        if self.t_type != Token_T.STRING:
+            raise WrongTokenError("Can't compile non-STRING token!")
+
+        if self.value.startswith(FIELD_FORCE_PREFIX):
+            return FieldDataGetter(self.value[len(FIELD_FORCE_PREFIX):]).compile()
+
+        if self.value.lstrip("-").isdecimal():
+            number = float(self.value)
+            return lambda mapping: number
+        return FieldDataGetter(self.value).compile()
+
+    def get_field_getter(self) -> Optional["FieldDataGetter"]:
+        """
+        Returns None if token is a numeric literal
+        """
+        if self.value.startswith(FIELD_FORCE_PREFIX):
+            return FieldDataGetter(self.value[len(FIELD_FORCE_PREFIX):])
+        if self.value.lstrip("-").isdecimal():
+            return None
+        return FieldDataGetter(self.value)
+
+    def result_kind(self) -> ResultKind:
+        return ResultKind.SCALAR if self.get_field_getter() is None else ResultKind.LIST
+
 
 class Tokenizer:
     def __init__(self, exp: str):
@@ -650,17 +711,182 @@ class FieldDataGetter(Computable):
         traverse_recursively(mapping)
         return result
 
+    @staticmethod
+    def _compile_step(current_key: str,
+                      next_step: Callable[[Any, list], None]) -> Callable[[Any, list], None]:
+        """
+        Builds one level of traverse_recursively with the key resolved ahead of time
+        """
+        index = None
+        if current_key.startswith(DIGIT_FORCE_PREFIX):
+            current_key = current_key[len(DIGIT_FORCE_PREFIX):]
+            if current_key.lstrip("-").isdecimal():
+                index = int(current_key)
+                current_key = float(current_key)
+
+        if current_key == FieldDataGetter.ANY_FIELD:
+            def mapping_step(entry: Any, result: list) -> None:
+                if not isinstance(entry, Mapping):
+                    return
+                for key in entry:
+                    if (val := entry.get(key)) is not None:
+                        next_step(val, result)
+                if (val := entry.get(current_key)) is not None:
+                    next_step(val, result)
+
+        elif current_key == FieldDataGetter.SELF_FIELD:
+            def mapping_step(entry: Any, result: list) -> None:
+                if not isinstance(entry, Mapping):
+                    return
+                next_step(entry, result)
+                if (val := entry.get(current_key)) is not None:
+                    next_step(val, result)
+
+        else:
+            def mapping_step(entry: Any, result: list) -> None:
+                if isinstance(entry, Mapping) and (val := entry.get(current_key)) is not None:
+                    next_step(val, result)
+
+        if index is None:
+            return mapping_step
+
+        def index_step(entry: Any, result: list) -> None:
+            if isinstance(entry, (list, tuple)):
+                if len(entry) > index:
+                    next_step(entry[index], result)
+                return
+            mapping_step(entry, result)
+        return index_step
+
+    def compile(self) -> Callable[[Mapping], list[Any]]:
+        def leaf(entry: Any, result: list) -> None:
+            result.append(list(entry.keys())) if isinstance(entry, Mapping) else result.append(entry)
+
+        step = leaf
+        for current_key in reversed(self.query_chain):
+            step = self._compile_step(current_key, step)
+
+        def get_field_data(mapping: Mapping) -> list[Any]:
+            result = []
+            step(mapping, result)
+            return result
+        return get_field_data
+
+    def result_kind(self) -> ResultKind:
+        return ResultKind.LIST
+
+
+class FieldIndex:
+    """
+    Inverted index over cards: field path -> {str(field value): card ids}.
+    Every field path is indexed on its first search and is kept up to date by add after that.
+    Card id is id() of the card, so cards are expected to be immutable and to be kept alive by the deck
+    """
+    __slots__ = "_cards", "_postings"
+
+    def __init__(self, cards: Iterable[Mapping] = ()):
+        self._cards: list[Mapping] = list(cards)
+        self._postings: dict[tuple[str, ...], tuple[Callable[[Mapping], list[Any]], dict[str, set[int]]]] = {}
+
+    @staticmethod
+    def _index_card(card: Mapping,
+                    field_getter: Callable[[Mapping], list[Any]],
+                    postings: dict[str, set[int]]) -> None:
+        card_id = id(card)
+        for value in field_getter(card):
+            postings.setdefault(str(value), set()).add(card_id)
+
+    def add(self, cards: Iterable[Mapping]) -> None:
+        for card in cards:
+            self._cards.append(card)
+            for field_getter, postings in self._postings.values():
+                self._index_card(card, field_getter, postings)
+
+    def all_ids(self) -> set[int]:
+        return {id(card) for card in self._cards}
+
+    def _get_postings(self, path: FieldDataGetter) -> dict[str, set[int]]:
+        key = tuple(path.query_chain)
+        if (indexed_path := self._postings.get(key)) is None:
+            field_getter = path.compile()
+            postings = {}
+            for card in self._cards:
+                self._index_card(card, field_getter, postings)
+            self._postings[key] = indexed_path = (field_getter, postings)
+        return indexed_path[1]
+
+    def search(self, path: FieldDataGetter, search_pattern: re.Pattern) -> set[int]:
+        """
+        :return: ids of cards where at least one value of the path matches search_pattern
+        """
+        res = set()
+        for value, card_ids in self._get_postings(path).items():
+            if search_pattern.search(value) is not None:
+                res |= card_ids
+        return res
+
 
 @dataclass(slots=True, frozen=True)
 class Method(Computable):
     operand: Computable
 
     method: Callable[[Any], int]
+    name: str = ""
 
     def compute(self, mapping: Mapping) -> Union[Iterator[int], int]:
         computed_operand = self.operand.compute(mapping)
         return self.method(computed_operand)
 
+    def compile(self) -> Callable[[Mapping], Any]:
+        operand = self.operand.compile()
+        method = self.method
+        return lambda mapping: method(operand(mapping))
+
+    def result_kind(self) -> ResultKind:
+        if self.name in ("len", "any", "all"):
+            return ResultKind.SCALAR
+        if self.name in ("lower", "upper"):
+            return self.operand.result_kind()
+        return ResultKind.UNKNOWN
+
+
+@dataclass(slots=True, frozen=True)
+class Keyword(Computable):
+    operand: Computable
+    name: str
+    search_pattern: re.Pattern
+    keyword: Callable[[Any, re.Pattern], bool] = field(init=False, repr=False)
+
+    def __post_init__(self):
+        object.__setattr__(self, "keyword", keyword_factory(self.name))
+
+    def compute(self, mapping: Mapping) -> bool:
+        return self.keyword(self.operand.compute(mapping), self.search_pattern)
+
+    def compile(self) -> Callable[[Mapping], bool]:
+        operand = self.operand.compile()
+        keyword = self.keyword
+        search_pattern = self.search_pattern
+        return lambda mapping: keyword(operand(mapping), search_pattern)
+
+    def result_kind(self) -> ResultKind:
+        return ResultKind.SCALAR
+
+    def plan(self, index: FieldIndex) -> Plan:
+        if self.name != "in":
+            return NO_PLAN
+
+        if isinstance(self.operand, Token):
+            field_getter = self.operand.get_field_getter()
+        elif isinstance(self.operand, FieldDataGetter):
+            field_getter = self.operand
+        else:
+            field_getter = None
+
+        if field_getter is None:
+            return NO_PLAN
+        return index.search(field_getter, self.search_pattern), True
+
 
 @dataclass(slots=True, frozen=True)
 class EvalNode(Computable):
@@ -675,11 +901,60 @@ class EvalNode(Computable):
 
     def compute(self, mapping: Mapping) -> bool:
         if self.left is not None and self.right is not None:
-            return self.operation(self.left, self.right, mapping)
+            return self.operation(self.left.compute, self.right.compute, mapping)
+        elif self.left is not None:
+            return self.operation(self.left.compute, mapping)
+        raise TreeBuildingError("Empty node!")
+
+    def compile(self) -> Callable[[Mapping], Any]:
+        if self.left is not None and self.right is not None:
+            return partial(self.operation, self.left.compile(), self.right.compile())
         elif self.left is not None:
-            return self.operation(self.left, mapping)
+            return partial(self.operation, self.left.compile())
         raise TreeBuildingError("Empty node!")
 
+    def result_kind(self) -> ResultKind:
+        operand_kinds = [operand.result_kind() for operand in (self.left, self.right) if operand is not None]
+        if ResultKind.LIST in operand_kinds:
+            return ResultKind.LIST
+        if all(kind == ResultKind.SCALAR for kind in operand_kinds):
+            return ResultKind.SCALAR
+        return ResultKind.UNKNOWN
+
+    def plan(self, index: FieldIndex) -> Plan:
+        kind = self.result_kind()
+        if kind == ResultKind.LIST:
+            # list-like operands make logic operators return generators, which are always truthy
+            return None, True
+        if kind != ResultKind.SCALAR:
+            return NO_PLAN
+
+        # for scalar operands truthiness of the result follows the usual boolean logic
+        if self.operator == "not":
+            candidates, exact = self.left.plan(index)
+            if not exact:
+                return NO_PLAN
+            return (set() if candidates is None else index.all_ids() - candidates), True
+
+        if self.operator == "and":
+            left_candidates, left_exact = self.left.plan(index)
+            right_candidates, right_exact = self.right.plan(index)
+            if left_candidates is None:
+                return right_candidates, left_exact and right_exact
+            if right_candidates is None:
+                return left_candidates, left_exact and right_exact
+            return left_candidates & right_candidates, left_exact and right_exact
+
+        if self.operator == "or":
+            left_candidates, left_exact = self.left.plan(index)
+            right_candidates, right_exact = self.right.plan(index)
+            if left_candidates is None and left_exact or right_candidates is None and right_exact:
+                return None, True
+            if left_candidates is None or right_candidates is None:
+                return NO_PLAN
+            return left_candidates | right_candidates, left_exact and right_exact
+        return NO_PLAN
+
 
 class EvaluationTree:
     def __init__(self, tokens):
@@ -694,7 +969,6 @@ class EvaluationTree:
             if next_item.t_type == Token_T.KEYWORD:
                 query = self._expressions.pop(string_index).value
                 keyword_name = self._expressions.pop(string_index).value
-                keyword_function = partial(keyword_factory(keyword_name), search_pattern=re.compile(query))
 
                 if self._expressions[string_index].t_type == Token_T.L_PARENTHESIS:
                     self._expressions.pop(string_index)
@@ -704,7 +978,7 @@ class EvaluationTree:
                     build_expression(string_index)
 
                 operand = self._expressions.pop(string_index)
-                self._expressions.insert(string_index, Method(operand, keyword_function))
+                self._expressions.insert(string_index, Keyword(operand, keyword_name, re.compile(query)))
 
             elif next_item.t_type == Token_T.L_PARENTHESIS:
                 method_name = self._expressions.pop(string_index).value
@@ -713,7 +987,7 @@ class EvaluationTree:
                 build_expression(string_index)
                 build_logic(string_index)
                 operand = self._expressions.pop(string_index)
-                self._expressions.insert(string_index, Method(operand, method_function))
+                self._expressions.insert(string_index, Method(operand, method_function, method_name))
 
         def build_logic(start_index: int):
             logic_start = start_index
@@ -776,6 +1050,23 @@ class EvaluationTree:
         return self._expressions[0]
 
 
+class CardFilter:
+    """
+    Compiled query that can also narrow down searched cards with a field index
+    """
+    __slots__ = "_master_node", "_compiled"
+
+    def __init__(self, master_node: Computable):
+        self._master_node = master_node
+        self._compiled = master_node.compile()
+
+    def __call__(self, mapping: Mapping) -> Any:
+        return self._compiled(mapping)
+
+    def plan(self, index: FieldIndex) -> Plan:
+        return self._master_node.plan(index)
+
+
 def get_card_filter(expression: str) -> Callable[[Mapping], bool]:
     _tokenizer = Tokenizer(expression)
     tokens = _tokenizer.get_tokens()
@@ -784,7 +1075,7 @@ def get_card_filter(expression: str) -> Callable[[Mapping], bool]:
 
     _logic_tree = EvaluationTree(tokens)
     _logic_tree.construct()
-    return _logic_tree.get_master_node().compute
+    return CardFilter(_logic_tree.get_master_node())
 
 
 def main():
@@ -840,5 +1131,62 @@ def main():
     result = card_filter(test_card)
     print(result)
 
+    import gc
+    import json
+    import os
+    import random
+    import tempfile
+    import time
+
+    from app_utils.cards import Deck
+
+    random.seed(0)
+    n_cards = 100_000
+    cards = [{FIELDS.word: f"word_{i}",
+              FIELDS.definition: f"definition of word_{i}",
+              FIELDS.sentences: [f"sentence {j}" for j in range(random.randint(0, 8))],
+              FIELDS.dict_tags: {"pos": random.choice(("noun", "verb", "adjective")),
+                                 "level": [random.choice(("A1", "B1", "C1"))]}}
+             for i in range(n_cards)]
+    with tempfile.TemporaryDirectory() as temp_dir:
+        deck_path = os.path.join(temp_dir, "deck.json")
+        with open(deck_path, "w", encoding="UTF-8") as f:
+            json.dump(cards, f)
+        deck = Deck(deck_path, current_deck_pointer=0, card_generator=None)
+
+    benchmark_queries = ("word_1 in word",
+                         "len(examples) < 3 and noun in tags[pos]",
+                         "(C1 in tags[level]) or len(examples) == 0",
+                         "verb in tags[$ANY]",
+                         "(C1 in tags[level]) and (noun in tags[pos] or verb in tags[pos])",
+                         "word_1 in word == 0")
+    def measure(function: Callable[[], Any]) -> tuple[Any, float]:
+        # garbage collection is paused the same way timeit does it:
+        # otherwise full collections over the whole deck dominate the timings
+        gc.disable()
+        try:
+            start = time.perf_counter()
+            res = function()
+            return res, time.perf_counter() - start
+        finally:
+            gc.enable()
+
+    for query in benchmark_queries:
+        tokens = Tokenizer(query).get_tokens()
+        tree = EvaluationTree(tokens)
+        tree.construct()
+        master_node = tree.get_master_node()
+
+        interpreted_res, interpreted_time = measure(lambda: list(deck.find_card(master_node.compute)))
+        compiled_res, compiled_time = measure(lambda: list(deck.find_card(master_node.compile())))
+
+        card_filter = get_card_filter(query)
+        _, cold_index_time = measure(lambda: deck.find_card(card_filter))
+        indexed_res, indexed_time = measure(lambda: list(deck.find_card(card_filter)))
+
+        assert interpreted_res == compiled_res == indexed_res
+        print(f"{query}: interpreted {interpreted_time:.3f}s, compiled {compiled_time:.3f}s, "
+              f"indexed {indexed_time:.3f}s (first search with index building {cold_index_time:.3f}s)")
+
 if __name__ == "__main__":
     main()
@@ -1,11 +1,35 @@
-import copy
+import os
+import sqlite3
+import time
+from collections.abc import MutableSequence
 from json import JSONEncoder
-from typing import Any, TypeVar, Mapping, Generic
+from threading import Lock
+from typing import Any, TypeVar, Mapping, Generic, Optional
+from typing import Iterable, Iterator, TextIO
 
 from app_utils.preprocessing import validate_json
 
 
+def _copy_container(value: Any) -> Any:
+    """
+    Copies dicts, lists and tuples recursively and shares everything else,
+    which is the same as copy.deepcopy for parsed JSON but much faster
+    """
+    if isinstance(value, dict):
+        return {key: _copy_container(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_copy_container(item) for item in value]
+    if isinstance(value, tuple):
+        return tuple(_copy_container(item) for item in value)
+    if isinstance(value, _FrozenDictNode):
+        return value.to_dict()
+    return value
+
+
 class _FrozenDictNode(Mapping):
+    """
+    Read-only view of a dict. Nested dicts are wrapped into views when they are accessed
+    """
     __slots__ = "_data"
 
     def __init__(self, data: dict[Any, Any]):
@@ -15,7 +39,9 @@ class _FrozenDictNode(Mapping):
         return len(self._data)
 
     def __getitem__(self, item):
-        return self._data[item]
+        if isinstance((value := self._data[item]), dict):
+            return _FrozenDictNode(value)
+        return value
 
     def __iter__(self):
         return iter(self._data)
@@ -27,43 +53,45 @@ class _FrozenDictNode(Mapping):
         return bool(self._data)
 
     def to_dict(self):
-        return self._data
+        """
+        Returns a copy that can be modified without touching the view
+        """
+        return _copy_container(self._data)
 
 
 class FrozenDict(_FrozenDictNode):
+    """
+    Wraps data in place without copying it, so data must not be modified after wrapping
+    """
     __slots__ = ()
 
     def __init__(self, data: dict[Any, Any]):
-        def _convert_to_frozen_node(master: dict, master_key: Any, proc_unit: Any):
-            if isinstance(proc_unit, dict):
-                for proc_key in proc_unit:
-                    if isinstance((proc_val := proc_unit[proc_key]), dict):
-                        _convert_to_frozen_node(proc_unit, proc_key, proc_val)
-                master[master_key] = _FrozenDictNode(proc_unit)
-            else:
-                master[master_key] = proc_unit
-
-        master_dict = copy.deepcopy(data)
-        for key in master_dict:
-            _convert_to_frozen_node(master_dict, key, master_dict[key])
-
-        super(FrozenDict, self).__init__(data=master_dict)
-
-    def to_dict(self):
-        def convert(data: _FrozenDictNode):
-            # you make a deepcopy so that you wouldn't overwrite original _data
-            a = copy.deepcopy(data._data)
-            for key in a:
-                if isinstance((value:=a[key]), _FrozenDictNode):
-                    value = convert(value)
-                    a[key] = value
-            return a
-        return convert(self)
+        super(FrozenDict, self).__init__(data=data)
 
 
 class FrozenDictJSONEncoder(JSONEncoder):
     def default(self, o):
-        return o.to_dict()
+        # nested views are met by the encoder again, so nothing has to be copied
+        return o._data
+
+
+def dump_json_array(items: Iterable[Any], fp: TextIO, cls: type[JSONEncoder] = JSONEncoder, **kwargs) -> int:
+    """
+    Writes items to fp as a JSON array one item at a time, so that items can come from a generator.
+    Output is the same as of json.dump(list(items), fp, cls=cls, **kwargs) with default separators
+    :return: number of written items
+    """
+    # encode (unlike json.dump) goes through the C accelerated encoder
+    encode = cls(**kwargs).encode
+    fp.write("[")
+    n_items = 0
+    for item in items:
+        if n_items:
+            fp.write(", ")
+        fp.write(encode(item))
+        n_items += 1
+    fp.write("]")
+    return n_items
 
 
 _T = TypeVar("_T")
@@ -124,6 +152,178 @@ class PointerList(Generic[_T]):
         self._pointer_position = min(max(self._pointer_position + n, self.get_starting_position()), len(self))
 
 
+class GapBuffer(MutableSequence, Generic[_T]):
+    """
+    List with cheap insertion next to the previous insertion point.
+    Items before the gap are kept in one list and items after it in another one in reversed order,
+    so moving the gap by k positions costs O(k) and insertion at the gap costs O(1)
+    """
+    __slots__ = "_before", "_after"
+
+    def __init__(self, data: Iterable[_T] = ()):
+        self._before: list[_T] = list(data)
+        self._after: list[_T] = []
+
+    def _move_gap(self, index: int) -> None:
+        if index < len(self._before):
+            self._after.extend(reversed(self._before[index:]))
+            del self._before[index:]
+        elif index > len(self._before):
+            n_moved = index - len(self._before)
+            moved = self._after[-n_moved:]
+            del self._after[-n_moved:]
+            self._before.extend(reversed(moved))
+
+    def _normalize_index(self, index: int) -> int:
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("GapBuffer index out of range")
+        return index
+
+    def __len__(self) -> int:
+        return len(self._before) + len(self._after)
+
+    def __getitem__(self, item):
+        if isinstance(item, slice):
+            start, stop, step = item.indices(len(self))
+            if step != 1:
+                return [self[i] for i in range(start, stop, step)]
+            if stop <= start:
+                return []
+            gap = len(self._before)
+            res = self._before[start:min(stop, gap)]
+            if stop > gap:
+                # positions [max(start, gap), stop) of the buffer in the reversed list
+                after_start = len(self._after) - (stop - gap)
+                after_stop = len(self._after) - (max(start, gap) - gap)
+                res.extend(reversed(self._after[after_start:after_stop]))
+            return res
+
+        item = self._normalize_index(item)
+        if item < len(self._before):
+            return self._before[item]
+        return self._after[len(self._after) - 1 - (item - len(self._before))]
+
+    def __setitem__(self, item: int, value: _T) -> None:
+        item = self._normalize_index(item)
+        if item < len(self._before):
+            self._before[item] = value
+        else:
+            self._after[len(self._after) - 1 - (item - len(self._before))] = value
+
+    def __delitem__(self, item) -> None:
+        if isinstance(item, slice):
+            start, stop, step = item.indices(len(self))
+            if step != 1:
+                for i in sorted(range(start, stop, step), reverse=True):
+                    del self[i]
+                return
+            if stop > start:
+                self._move_gap(start)
+                del self._after[len(self._after) - (stop - start):]
+            return
+
+        item = self._normalize_index(item)
+        self._move_gap(item + 1)
+        self._before.pop()
+
+    def __iter__(self) -> Iterator[_T]:
+        yield from self._before
+        yield from reversed(self._after)
+
+    def __repr__(self):
+        return f"GapBuffer {list(self)}"
+
+    def insert(self, index: int, value: _T) -> None:
+        self.insert_many(index, (value,))
+
+    def insert_many(self, index: int, values: Iterable[_T]) -> None:
+        """
+        Same as self[index:index] = values
+        """
+        self._move_gap(max(0, min(index + len(self) if index < 0 else index, len(self))))
+        self._before.extend(values)
+
+    def append(self, value: _T) -> None:
+        self._move_gap(len(self))
+        self._before.append(value)
+
+    def extend(self, values: Iterable[_T]) -> None:
+        self._move_gap(len(self))
+        self._before.extend(values)
+
+
+class DiskLRUStore:
+    """
+    Thread safe size bounded key-value storage kept in a SQLite file.
+    Least recently used entries are evicted when total size of values exceeds max_size (in bytes)
+    """
+    __slots__ = "_connection", "_lock", "_max_size", "_total_size"
+
+    def __init__(self, path: str, max_size: int):
+        if (directory := os.path.dirname(path)) and not os.path.isdir(directory):
+            os.makedirs(directory)
+
+        self._connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._connection.execute("CREATE TABLE IF NOT EXISTS entries ("
+                                 "key TEXT PRIMARY KEY, "
+                                 "value BLOB NOT NULL, "
+                                 "size INTEGER NOT NULL, "
+                                 "created REAL NOT NULL, "
+                                 "accessed REAL NOT NULL)")
+        self._connection.execute("CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed)")
+        self._lock = Lock()
+        self._max_size = max_size
+        self._total_size: int = self._connection.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        with self._lock:
+            self._evict()
+
+    def get(self, key: str) -> Optional[tuple[bytes, float]]:
+        """
+        :return: (value, creation timestamp) or None if there is no such key
+        """
+        with self._lock:
+            if (row := self._connection.execute("SELECT value, created FROM entries WHERE key = ?",
+                                                (key,)).fetchone()) is None:
+                return None
+            self._connection.execute("UPDATE entries SET accessed = ? WHERE key = ?", (time.time(), key))
+        return row
+
+    def put(self, key: str, value: bytes) -> None:
+        if len(value) > self._max_size:
+            return
+
+        now = time.time()
+        with self._lock:
+            if (row := self._connection.execute("SELECT size FROM entries WHERE key = ?", (key,)).fetchone()) \
+                    is not None:
+                self._total_size -= row[0]
+            self._connection.execute("INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?)",
+                                     (key, value, len(value), now, now))
+            self._total_size += len(value)
+            self._evict()
+
+    def _evict(self) -> None:
+        while self._total_size > self._max_size:
+            key, size = self._connection.execute("SELECT key, size FROM entries "
+                                                 "ORDER BY accessed LIMIT 1").fetchone()
+            self._connection.execute("DELETE FROM entries WHERE key = ?", (key,))
+            self._total_size -= size
+
+    def get_total_size(self) -> int:
+        return self._total_size
+
+    def set_max_size(self, max_size: int) -> None:
+        with self._lock:
+            self._max_size = max_size
+            self._evict()
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+
 def main():
     standard_conf_file = {"app": {"theme": "dark",
                                   "main_window_geometry": "500x800+0+0",
@@ -178,6 +378,29 @@ def main():
     validate_json(checking, standard_conf_file)
     assert checking == standard_conf_file
 
+    import time
+
+    deck_size = 200_000
+    n_insertions = 10_000
+
+    # insertion pattern of Deck.append: insert at the pointer and move past the inserted card
+    spliced = list(range(deck_size))
+    start = time.perf_counter()
+    for i in range(n_insertions):
+        position = deck_size // 2 + 2 * i
+        spliced = spliced[:position] + [-i] + spliced[position:]
+    splicing_time = time.perf_counter() - start
+
+    gap_buffer = GapBuffer(range(deck_size))
+    start = time.perf_counter()
+    for i in range(n_insertions):
+        gap_buffer.insert(deck_size // 2 + 2 * i, -i)
+    gap_buffer_time = time.perf_counter() - start
+
+    assert list(gap_buffer) == spliced
+    print(f"{n_insertions} insertions into {deck_size} items: "
+          f"list splicing {splicing_time:.3f}s, gap buffer {gap_buffer_time:.3f}s")
+
 
 if __name__ == "__main__":
     main()
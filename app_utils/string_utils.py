@@ -1,5 +1,7 @@
 import re
 from enum import IntEnum
+from functools import lru_cache, partial
+from typing import Callable
 
 LETTERS = set("abcdefghijklmnopqrstuvwxyz")
 
@@ -31,6 +33,16 @@ def get_search_pattern(query: str,
     return pattern
 
 
+@lru_cache(maxsize=128)
+def _get_special_chars_replacer(special_chars: str, sep: str) -> Callable[[str], str]:
+    """
+    :return: function that replaces every run of special chars with sep
+    """
+    pattern = re.compile(f"[{re.escape(special_chars)}]+")
+    # backslashes of a replacement string are treated as escapes by re.sub
+    return partial(pattern.sub, sep.replace("\\", "\\\\"))
+
+
 def remove_special_chars(text, sep=" ", special_chars='№!"#$%&\'()*+,-./:;<=>?@[\\]^_`{|}~ '):
     """
     :param text: to to clean
@@ -38,18 +50,11 @@ def remove_special_chars(text, sep=" ", special_chars='№!"#$%&\'()*+,-./:;<=>?
     :param special_chars: special characters to remove
     :return:
     """
-    new_text = ""
-    start_index = 0
-    while start_index < len(text) and text[start_index] in special_chars:
-        start_index += 1
-
-    while start_index < len(text):
-        if text[start_index] in special_chars:
-            while text[start_index] in special_chars:
-                start_index += 1
-                if start_index >= len(text):
-                    return new_text
-            new_text += sep
-        new_text += text[start_index]
-        start_index += 1
-    return new_text.strip(sep)
+    if not special_chars:
+        return text.strip(sep)
+
+    text = text.lstrip(special_chars)
+    # seps are left at the edges when text ends with special chars
+    if text and text[-1] in special_chars:
+        return _get_special_chars_replacer(special_chars, sep)(text.rstrip(special_chars))
+    return _get_special_chars_replacer(special_chars, sep)(text).strip(sep)
@@ -0,0 +1,130 @@
+import re
+from bisect import bisect_left
+from typing import Iterable, Optional
+
+from app_utils.string_utils import SearchType
+
+_TOKEN_PATTERN = re.compile(r"\w+")
+# any of these characters turns a query into a real regular expression,
+# which can't be answered by the index
+_REGEX_SPECIAL_CHARS = re.compile(r"[.^$*+?{}\[\]\\|()]")
+
+
+class WordIndex:
+    """
+    Whole-word index over dictionary headwords.
+
+    Every headword is split into lowercase word tokens. Each token keeps a posting list of
+    headword positions, while sorted arrays of tokens and reversed tokens answer prefix
+    and suffix queries with a binary search.
+    lookup returns a superset of the positions that match the pattern built by
+    string_utils.get_search_pattern with case_sensitive=False, or None when the query
+    can't be narrowed down and every headword has to be checked.
+    """
+    __slots__ = "_postings", "_tokens", "_reversed_tokens"
+
+    def __init__(self, headwords: Iterable[str]):
+        postings: dict[str, list[int]] = {}
+        for i, headword in enumerate(headwords):
+            for token in set(_TOKEN_PATTERN.findall(headword.lower())):
+                postings.setdefault(token, []).append(i)
+
+        self._postings = postings
+        self._tokens = sorted(postings)
+        self._reversed_tokens = sorted(token[::-1] for token in postings)
+
+    def _exact(self, token: str) -> set[int]:
+        return set(self._postings.get(token, ()))
+
+    def _prefix(self, prefix: str) -> set[int]:
+        res = set()
+        for i in range(bisect_left(self._tokens, prefix), len(self._tokens)):
+            if not (token := self._tokens[i]).startswith(prefix):
+                break
+            res.update(self._postings[token])
+        return res
+
+    def _suffix(self, suffix: str) -> set[int]:
+        reversed_suffix = suffix[::-1]
+        res = set()
+        for i in range(bisect_left(self._reversed_tokens, reversed_suffix), len(self._reversed_tokens)):
+            if not (reversed_token := self._reversed_tokens[i]).startswith(reversed_suffix):
+                break
+            res.update(self._postings[reversed_token[::-1]])
+        return res
+
+    def lookup(self, query: str, search_type: SearchType = SearchType.EVERYWHERE) -> Optional[list[int]]:
+        query = query.strip().lower()
+        if _REGEX_SPECIAL_CHARS.search(query) is not None:
+            return None
+
+        query_tokens = list(_TOKEN_PATTERN.finditer(query))
+        if not query_tokens:
+            return None
+
+        # a token that touches the edge of the query can be a part of a longer headword token
+        # unless the search pattern puts a word boundary there
+        open_start = search_type in (SearchType.BACKWARD, SearchType.EVERYWHERE) and \
+                     query_tokens[0].start() == 0
+        open_end = search_type in (SearchType.FORWARD, SearchType.EVERYWHERE) and \
+                   query_tokens[-1].end() == len(query)
+        if open_start and open_end and len(query_tokens) == 1:
+            return None
+
+        candidates: Optional[set[int]] = None
+        for i, match in enumerate(query_tokens):
+            token = match.group()
+            if i == 0 and open_start:
+                found = self._suffix(token)
+            elif i == len(query_tokens) - 1 and open_end:
+                found = self._prefix(token)
+            else:
+                found = self._exact(token)
+
+            candidates = found if candidates is None else candidates & found
+            if not candidates:
+                return []
+        return sorted(candidates)
+
+
+def main():
+    import random
+    import string
+    import time
+
+    from app_utils.string_utils import get_search_pattern
+
+    random.seed(0)
+    n_entries = 500_000
+    n_queries = 200
+
+    def random_word() -> str:
+        return "".join(random.choices(string.ascii_lowercase, k=random.randint(3, 10)))
+
+    headwords = [" ".join(random_word() for _ in range(random.choices((1, 2, 3), (8, 3, 1))[0]))
+                 for _ in range(n_entries)]
+    queries = [random.choice(headwords).split()[0] for _ in range(n_queries)]
+
+    start = time.perf_counter()
+    index = WordIndex(headwords)
+    print(f"Index build for {n_entries} entries: {time.perf_counter() - start:.3f}s")
+
+    for search_type in (SearchType.EXACT, SearchType.FORWARD, SearchType.BACKWARD):
+        patterns = [get_search_pattern(query, search_type, case_sensitive=False) for query in queries]
+
+        start = time.perf_counter()
+        scan_res = [[i for i, word in enumerate(headwords) if pattern.search(word)] for pattern in patterns]
+        scan_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        index_res = [[i for i in index.lookup(query, search_type) if pattern.search(headwords[i])]
+                     for query, pattern in zip(queries, patterns)]
+        index_time = time.perf_counter() - start
+
+        assert scan_res == index_res
+        print(f"{search_type.name}: scan {scan_time / n_queries * 1000:.3f}ms/query, "
+              f"index {index_time / n_queries * 1000:.3f}ms/query")
+
+
+if __name__ == "__main__":
+    main()
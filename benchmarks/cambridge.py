@@ -0,0 +1,40 @@
+"""
+Regression benchmark of the Cambridge parser on saved pages.
+Parse results are checked against the parser that built the tree of the whole page before anything is timed.
+
+Usage (from the repository root):
+    python -m benchmarks.cambridge [saved html]...
+Pages from tests/fixtures/cambridge are used when no pages are given
+"""
+import sys
+import time
+
+from plugins.parsers.word_parsers.web.cambridge.utils import parse_page
+from tests.test_cambridge_parser import get_saved_pages, reference_parse_page
+
+N_RUNS = 5
+
+
+def main():
+    for page_path in sys.argv[1:] or get_saved_pages():
+        with open(page_path, "rb") as f:
+            page_content = f.read()
+
+        assert parse_page(page_content) == reference_parse_page(page_content), page_path
+
+        start = time.perf_counter()
+        for _ in range(N_RUNS):
+            reference_parse_page(page_content)
+        reference_time = (time.perf_counter() - start) / N_RUNS
+
+        start = time.perf_counter()
+        for _ in range(N_RUNS):
+            parse_page(page_content)
+        strained_time = (time.perf_counter() - start) / N_RUNS
+
+        print(f"{page_path}: full tree {reference_time * 1000:.1f}ms, "
+              f"dictionary blocks only {strained_time * 1000:.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+"""
+Benchmarks of SavedDataDeck and of saving formats on a large generated session.
+
+Usage (from the repository root):
+    python -m benchmarks.saved_cards
+"""
+import gc
+import json
+import os
+import tempfile
+import time
+import tracemalloc
+from typing import Callable
+
+from app_utils.cards import Card, CardStatus, SavedDataDeck, TagRenderer
+from app_utils.storages import FrozenDict, FrozenDictJSONEncoder
+from app_utils.string_utils import remove_special_chars
+from consts.card_fields import FIELDS
+from plugins.saving.format_processors import csv as csv_format
+from plugins.saving.format_processors import json_deck_audio, json_deck_cards
+
+N_CARDS = 50_000
+# long session where most of the cards are skipped in bulk
+N_SKIPPED = 1_000_000
+STATUSES = (CardStatus.ADD, CardStatus.SKIP, CardStatus.BURY)
+
+
+def make_session(n_cards: int) -> SavedDataDeck:
+    saved_data = SavedDataDeck()
+    for i in range(n_cards):
+        card_data = {FIELDS.word: f"word {i}",
+                     FIELDS.definition: f"definition of word {i}",
+                     FIELDS.sentences: [f"sentence with word {i}"],
+                     FIELDS.dict_tags: {"pos": ["noun", "verb"][i % 2], "level": f"B{i % 3}"},
+                     SavedDataDeck.ADDITIONAL_DATA: {
+                         SavedDataDeck.AUDIO_DATA: {SavedDataDeck.AUDIO_SRCS: [f"https://audio/{i}.mp3"],
+                                                    SavedDataDeck.AUDIO_SRCS_TYPE: SavedDataDeck.AUDIO_SRC_TYPE_WEB,
+                                                    SavedDataDeck.AUDIO_SAVING_PATHS: [f"{i}.mp3"]}}}
+        saved_data.append(STATUSES[i % 3], card_data)
+    return saved_data
+
+
+def measure(action: Callable[[], None]) -> tuple[float, int]:
+    """
+    :return: time (in s) and peak of traced memory (in bytes) of the action.
+    Memory is traced in a separate run, because tracing slows allocations down
+    """
+    gc.disable()
+    start = time.perf_counter()
+    action()
+    elapsed = time.perf_counter() - start
+    gc.enable()
+
+    tracemalloc.start()
+    action()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def benchmark_exports(saved_data: SavedDataDeck, saving_dir: str) -> None:
+    """
+    Saving formats stream saved cards, whereas the old exporters dumped lists of them
+    """
+    for name, saving_format, getter in (("cards", json_deck_cards, saved_data.get_card_data),
+                                        ("audio", json_deck_audio, saved_data.get_audio_data)):
+        saving_path = os.path.join(saving_dir, name)
+        listed_path = os.path.join(saving_dir, f"{name}_listed.json")
+
+        def dump_list():
+            with open(listed_path, "w", encoding="utf-8") as f:
+                json.dump(getter(CardStatus.ADD), f, cls=FrozenDictJSONEncoder)
+
+        list_time, list_peak = measure(dump_list)
+        stream_time, stream_peak = measure(
+            lambda: saving_format.save(saved_data, CardStatus.ADD, saving_path, lambda x: x, lambda x: x))
+        with open(listed_path, encoding="utf-8") as listed, open(saving_path + ".json", encoding="utf-8") as streamed:
+            assert listed.read() == streamed.read()
+        print(f"JSON {name} export of {len(saved_data)} cards session: "
+              f"list {list_time:.3f}s (peak {list_peak / 2 ** 20:.1f}MiB), "
+              f"streaming {stream_time:.3f}s (peak {stream_peak / 2 ** 20:.1f}MiB)")
+
+    csv_time, csv_peak = measure(
+        lambda: csv_format.save(saved_data, CardStatus.ADD, os.path.join(saving_dir, "cards"),
+                                lambda x: x, lambda x: x))
+    print(f"CSV export of {len(saved_data)} cards session: {csv_time:.3f}s (peak {csv_peak / 2 ** 20:.1f}MiB)")
+
+
+def benchmark_tags(saved_data: SavedDataDeck) -> None:
+    """
+    Compares processing of dictionary tags per card with the memoizing renderer that is shared by a whole export
+    """
+    tag_processor = lambda tag: remove_special_chars(tag, sep="_")
+    exported_cards = [card_page[SavedDataDeck.CARD_DATA] for card_page in saved_data.iter_card_pages(CardStatus.ADD)]
+    start = time.perf_counter()
+    per_card_tags = [Card.get_str_dict_tags(card, "deck", "::", tag_processor) for card in exported_cards]
+    per_card_time = time.perf_counter() - start
+    tag_renderer = TagRenderer(sep="::", tag_processor=tag_processor)
+    start = time.perf_counter()
+    rendered_tags = [tag_renderer.render(card, "deck") for card in exported_cards]
+    render_time = time.perf_counter() - start
+    assert per_card_tags == rendered_tags
+    print(f"Dictionary tags of {len(exported_cards)} cards: "
+          f"processed per card {per_card_time:.3f}s, memoized renderer {render_time:.3f}s")
+
+
+def benchmark_skipping(saved_data: SavedDataDeck, n_skipped: int) -> None:
+    """
+    Compares memory taken by a page per skipped card with the column-wise storage of skipped cards
+    """
+    tracemalloc.start()
+    skipped_pages = [FrozenDict({SavedDataDeck.CARD_STATUS: CardStatus.SKIP}) for _ in range(n_skipped)]
+    _, pages_peak = tracemalloc.get_traced_memory()
+    del skipped_pages
+    tracemalloc.reset_peak()
+    start = time.perf_counter()
+    saved_data.move(n_skipped)
+    move_time = time.perf_counter() - start
+    _, move_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"Skipping {n_skipped} cards: page per card {pages_peak / 2 ** 20:.1f}MiB, "
+          f"status array {move_peak / 2 ** 20:.1f}MiB ({move_time:.3f}s)")
+
+
+def benchmark_status_index(saved_data: SavedDataDeck) -> None:
+    """
+    Compares retrieval of buried cards through the status index with a scan of the whole session
+    """
+    start = time.perf_counter()
+    scanned = [card_page for card_page in saved_data
+               if card_page[SavedDataDeck.CARD_STATUS] == CardStatus.BURY]
+    scan_time = time.perf_counter() - start
+    start = time.perf_counter()
+    indexed = list(saved_data.iter_card_pages(CardStatus.BURY))
+    index_time = time.perf_counter() - start
+    assert scanned == indexed
+    print(f"Retrieval of {len(indexed)} buried cards out of {len(saved_data)}: "
+          f"scan {scan_time:.3f}s, status index {index_time:.5f}s")
+
+    # going back has to drop truncated pages from the index and from the statistics
+    saved_data.move(-(len(saved_data) - N_CARDS // 2))
+    assert [saved_data.get_card_status_stats(status) for status in STATUSES] == \
+           [sum(1 for card_page in saved_data if card_page[SavedDataDeck.CARD_STATUS] == status)
+            for status in STATUSES]
+
+
+def main():
+    saved_data = make_session(N_CARDS)
+    with tempfile.TemporaryDirectory() as saving_dir:
+        benchmark_exports(saved_data, saving_dir)
+    benchmark_tags(saved_data)
+    benchmark_skipping(saved_data, N_SKIPPED)
+    benchmark_status_index(saved_data)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,27 @@
+"""
+Benchmark of remove_special_chars against the character by character implementation it replaced.
+
+Usage (from the repository root):
+    python -m benchmarks.string_utils
+"""
+import random
+import time
+
+from app_utils.string_utils import remove_special_chars
+from tests.test_string_utils import reference_remove_special_chars
+
+N_WORDS = 100_000
+
+
+def main():
+    rng = random.Random(0)
+    words = [f"{rng.choice(['phrasal verb', 'noun', 'B2 level', 'good-looking'])} {i}!" for i in range(N_WORDS)]
+    for name, function in (("reference", reference_remove_special_chars), ("compiled", remove_special_chars)):
+        start = time.perf_counter()
+        for word in words:
+            function(word, "-")
+        print(f"{name}: {len(words)} calls in {time.perf_counter() - start:.3f}s")
+
+
+if __name__ == "__main__":
+    main()
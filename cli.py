@@ -0,0 +1,278 @@
+"""
+Headless entry point: defines words, resolves sentences and audios, downloads audios
+and writes saving formats without Tk.
+
+Usage examples:
+    python cli.py --words words.txt --output ./out/words
+    python cli.py --deck deck.json --filter "level == B2" --format json_deck_cards --output ./out/deck
+"""
+import argparse
+import os
+import re
+import sys
+from collections import deque
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Callable, Iterable, Iterator, Optional, TextIO
+
+from app_utils.audio_fetching import AudioFetcher
+from app_utils.cards import Card, CardGenerator, CardStatus, Deck, LocalCardGenerator, SavedDataDeck, WebCardGenerator
+from app_utils.search_checker import ParsingException, get_card_filter
+from app_utils.string_utils import SearchType, get_search_pattern
+from consts.card_fields import FIELDS
+from consts.paths import LOCAL_MEDIA_DIR
+from plugins_loading.containers import CardProcessorContainer
+from plugins_loading.factory import loaded_plugins
+from plugins_management.http_sessions import HostRateLimiter
+
+# the same as the one the app uses
+HEADERS = {'User-Agent': 'Mozilla/5.0 (Windows NT 6.1; Win64; x64)'}
+
+
+def parse_args(argv: Optional[list[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Mine cards and write them in saving formats without GUI")
+    parser.add_argument("--deck", help="deck JSON file whose cards are mined")
+    parser.add_argument("--start", type=int, default=0, help="index of the first mined deck card")
+    parser.add_argument("--words", nargs="*", default=[],
+                        help="files with words to define, one word per line (\"-\" for stdin)")
+    parser.add_argument("--filter", default="", help="query language filter applied to every card")
+    parser.add_argument("--output", required=True,
+                        help="path prefix of saved files (<output>.csv, <output>_audios.json)")
+    parser.add_argument("--word-parser", default="cambridge")
+    parser.add_argument("--word-parser-type", default="web", choices=("web", "local"))
+    parser.add_argument("--sentence-parser", default="sentencedict",
+                        help="used for cards without sentences. Empty string disables fetching")
+    parser.add_argument("--audio-getter", default="", help="audio getter name. Empty string uses card audio links")
+    parser.add_argument("--audio-getter-type", default="web", choices=("web", "local"))
+    parser.add_argument("--card-processor", default="Anki")
+    parser.add_argument("--format", default="csv", help="deck saving format")
+    parser.add_argument("--media-dir", default=".", help="where audios are going to be downloaded")
+    parser.add_argument("--no-audio-download", action="store_true",
+                        help="only write audio saving paths to <output>_audios.json")
+    parser.add_argument("--audio-timeout", type=float, default=5)
+    parser.add_argument("--tags", default="", help="user tags added to every card")
+    parser.add_argument("--hierarchical-prefix", default="")
+    parser.add_argument("--workers", type=int, default=4, help="number of concurrent definitions")
+    parser.add_argument("--request-delay", type=int, default=300,
+                        help="minimal delay (in ms) between two requests to the same source")
+    return parser.parse_args(argv)
+
+
+def ordered_map(pool: Executor, function: Callable, items: Iterable, window: int) -> Iterator:
+    """
+    Same as pool.map, but keeps at most window items in flight, so that items can be an endless stream
+    """
+    pending = deque()
+    for item in items:
+        pending.append(pool.submit(function, item))
+        if len(pending) >= window:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+def iter_words(paths: list[str]) -> Iterator[str]:
+    for path in paths:
+        words_file: TextIO = sys.stdin if path == "-" else open(path, "r", encoding="UTF-8")
+        try:
+            for line in words_file:
+                if (word := line.strip()):
+                    yield word
+        finally:
+            if words_file is not sys.stdin:
+                words_file.close()
+
+
+class CardResolver:
+    """
+    Fills cards the same way the app does when a card is added
+    """
+    __slots__ = "args", "card_processor", "sentence_parser", "audio_getter", "typed_word_parser_name", \
+                "_rate_limiter"
+
+    def __init__(self, args: argparse.Namespace, card_processor: CardProcessorContainer,
+                 typed_word_parser_name: str):
+        self.args = args
+        self.card_processor = card_processor
+        self.typed_word_parser_name = typed_word_parser_name
+        self.sentence_parser = loaded_plugins.get_sentence_parser(args.sentence_parser) \
+            if args.sentence_parser else None
+        self.audio_getter = None
+        if args.audio_getter:
+            self.audio_getter = loaded_plugins.get_web_audio_getter(args.audio_getter) \
+                if args.audio_getter_type == "web" else loaded_plugins.get_local_audio_getter(args.audio_getter)
+        self._rate_limiter = HostRateLimiter(min_interval=args.request_delay / 1000)
+
+    def _get_audio_data(self, word: str, dict_tags: dict, card_data: dict) -> Optional[dict]:
+        if self.audio_getter is not None:
+            provider = f"[{self.args.audio_getter_type}] {self.audio_getter.name}"
+            if self.args.audio_getter_type == "local":
+                if not (audio_srcs := self.audio_getter.get_local_audios(word, dict_tags)):
+                    return None
+                src_type = SavedDataDeck.AUDIO_SRC_TYPE_LOCAL
+            else:
+                self._rate_limiter.wait_host(provider)
+                ((audio_srcs, _), error_message) = self.audio_getter.get_web_audios(word, dict_tags)
+                if error_message or not audio_srcs:
+                    return None
+                audio_srcs = audio_srcs[:1]
+                src_type = SavedDataDeck.AUDIO_SRC_TYPE_WEB
+        elif (audio_srcs := card_data.get(FIELDS.audio_links, [])):
+            provider = self.typed_word_parser_name
+            src_type = SavedDataDeck.AUDIO_SRC_TYPE_WEB
+        else:
+            return None
+
+        return {SavedDataDeck.AUDIO_SRCS: audio_srcs,
+                SavedDataDeck.AUDIO_SRCS_TYPE: src_type,
+                SavedDataDeck.AUDIO_SAVING_PATHS: [
+                    os.path.join(self.args.media_dir,
+                                 self.card_processor.get_save_audio_name(word, provider, f"{i}", dict_tags))
+                    for i in range(len(audio_srcs))]}
+
+    def __call__(self, card: Card) -> dict:
+        """
+        Runs in a worker thread
+        :return: card data ready to be added to SavedDataDeck
+        """
+        card_data = card.to_dict()
+        self.card_processor.process_card(card_data)
+        word = card_data.get(FIELDS.word, "")
+        dict_tags = card_data.get(FIELDS.dict_tags, {})
+
+        sentences = card_data.get(FIELDS.sentences, [])
+        if not sentences and self.sentence_parser is not None and word:
+            self._rate_limiter.wait_host(f"[sentences] {self.sentence_parser.name}")
+            try:
+                sentences, _ = next(iter(self.sentence_parser.get_sentence_batch(word, 1)), ([], ""))
+            except Exception as e:
+                print(f"{word}: sentence fetching failed: {e}", file=sys.stderr)
+        card_data[FIELDS.sentences] = [sentences[0] if sentences else word]
+
+        additional = {}
+        if self.args.tags:
+            additional[SavedDataDeck.USER_TAGS] = self.args.tags
+        try:
+            if (audio_data := self._get_audio_data(word, dict_tags, card_data)) is not None:
+                additional[SavedDataDeck.AUDIO_DATA] = audio_data
+        except Exception as e:
+            print(f"{word}: audio fetching failed: {e}", file=sys.stderr)
+        if self.args.hierarchical_prefix:
+            additional[SavedDataDeck.HIERARCHICAL_PREFIX] = self.args.hierarchical_prefix
+        if additional:
+            card_data[SavedDataDeck.ADDITIONAL_DATA] = additional
+        return card_data
+
+
+def download_audios(saved_cards_data: SavedDataDeck, args: argparse.Namespace) -> tuple[int, int]:
+    """
+    Already existing files are kept (the same as skipping them in the app)
+    :return: (number of written audios, number of failures)
+    """
+    fetcher = AudioFetcher(headers=HEADERS, timeout=args.audio_timeout, request_delay=args.request_delay)
+    items = {}
+    for audio_data in saved_cards_data.iter_audio_data(CardStatus.ADD):
+        for src, dst in zip(audio_data[SavedDataDeck.AUDIO_SRCS], audio_data[SavedDataDeck.AUDIO_SAVING_PATHS]):
+            if dst not in items and not os.path.exists(dst):
+                items[dst] = (audio_data[SavedDataDeck.AUDIO_SRCS_TYPE], src)
+
+    n_failed = 0
+    with ThreadPoolExecutor(max_workers=args.workers) as pool:
+        errors = pool.map(lambda item: fetcher.write_to_dst(item[1][0], item[1][1], item[0]), items.items())
+        for dst, error in zip(items, errors):
+            if error is not None:
+                n_failed += 1
+                print(f"{dst}: audio downloading failed: {error}", file=sys.stderr)
+    return len(items) - n_failed, n_failed
+
+
+def get_card_generator(args: argparse.Namespace) -> CardGenerator:
+    if args.word_parser_type == "web":
+        word_parser = loaded_plugins.get_web_word_parser(args.word_parser)
+        return WebCardGenerator(parsing_function=word_parser.define,
+                                item_converter=word_parser.translate,
+                                scheme_docs=word_parser.scheme_docs)
+    word_parser = loaded_plugins.get_local_word_parser(args.word_parser)
+    return LocalCardGenerator(local_dict_path=f"{LOCAL_MEDIA_DIR}/{word_parser.local_dict_name}.json",
+                              item_converter=word_parser.translate,
+                              scheme_docs=word_parser.scheme_docs)
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    args = parse_args(argv)
+    if args.deck is None and not args.words:
+        print("Nothing to mine: pass --deck and/or --words", file=sys.stderr)
+        return 1
+
+    try:
+        card_filter = get_card_filter(args.filter) if args.filter else lambda _: True
+    except ParsingException as e:
+        print(f"Wrong filter: {e}", file=sys.stderr)
+        return 1
+
+    card_generator = get_card_generator(args)
+    typed_word_parser_name = f"[{args.word_parser_type}] {args.word_parser}"
+    card_processor = loaded_plugins.get_card_processor(args.card_processor)
+    deck_saver = loaded_plugins.get_deck_saving_formats(args.format)
+    audio_saver = loaded_plugins.get_deck_saving_formats("json_deck_audio")
+    resolve_card = CardResolver(args, card_processor, typed_word_parser_name)
+    definition_limiter = HostRateLimiter(min_interval=args.request_delay / 1000
+                                                      if args.word_parser_type == "web" else 0)
+
+    def define(word: str) -> tuple[str, list[Card], Optional[Exception]]:
+        """
+        Runs in a worker thread
+        """
+        definition_limiter.wait_host(typed_word_parser_name)
+        try:
+            exact_pattern = get_search_pattern(word, SearchType.EXACT, case_sensitive=False)
+            return word, card_generator.get(query=word,
+                                            word_filter=lambda comparable: re.search(exact_pattern, comparable),
+                                            search_type=SearchType.EXACT), None
+        except Exception as e:
+            return word, [], e
+
+    n_not_found = 0
+    n_failed = 0
+
+    def iter_cards(pool: Executor) -> Iterator[Card]:
+        nonlocal n_not_found, n_failed
+
+        if args.deck is not None:
+            deck = Deck(deck_path=args.deck, current_deck_pointer=0, card_generator=card_generator)
+            yield from deck[args.start:]
+        for word, cards, error in ordered_map(pool, define, iter_words(args.words), window=2 * args.workers):
+            if error is not None:
+                n_failed += 1
+                print(f"{word}: definition failed: {error}", file=sys.stderr)
+            elif not cards:
+                n_not_found += 1
+                print(f"{word}: not found", file=sys.stderr)
+            yield from cards
+
+    saved_cards_data = SavedDataDeck()
+    with ThreadPoolExecutor(max_workers=args.workers) as definition_pool, \
+            ThreadPoolExecutor(max_workers=args.workers) as resolution_pool:
+        filtered_cards = (card for card in iter_cards(definition_pool) if card_filter(card))
+        for card_data in ordered_map(resolution_pool, resolve_card, filtered_cards, window=2 * args.workers):
+            saved_cards_data.append(status=CardStatus.ADD, card_data=card_data)
+
+    if (output_dir := os.path.dirname(args.output)) and not os.path.isdir(output_dir):
+        os.makedirs(output_dir)
+    deck_saver.save(saved_cards_data, CardStatus.ADD, args.output,
+                    card_processor.get_card_image_name, card_processor.get_card_audio_name)
+    audio_saver.save(saved_cards_data, CardStatus.ADD, f"{args.output}_audios",
+                     card_processor.get_card_image_name, card_processor.get_card_audio_name)
+
+    print(f"Saved: {saved_cards_data.get_card_status_stats(CardStatus.ADD)}, "
+          f"not found: {n_not_found}, failed: {n_failed}")
+
+    if not args.no_audio_download:
+        if not os.path.isdir(args.media_dir):
+            os.makedirs(args.media_dir)
+        n_downloaded, n_audio_failed = download_audios(saved_cards_data, args)
+        print(f"Audios downloaded: {n_downloaded}, failed: {n_audio_failed}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -6,6 +6,9 @@ CURRENT_WORKING_DIR = Path(os.getcwd())
 LOCAL_MEDIA_DIR = CURRENT_WORKING_DIR / "media"
 HISTORY_FILE_PATH = CURRENT_WORKING_DIR / "history.json"
 CONFIG_FILE_PATH = CURRENT_WORKING_DIR / "config.json"
+WEB_CACHE_PATH = CURRENT_WORKING_DIR / "cache" / "web_cache.sqlite"
+IMAGE_CACHE_PATH = CURRENT_WORKING_DIR / "cache" / "image_cache.sqlite"
+PLUGIN_MANIFEST_PATH = CURRENT_WORKING_DIR / "cache" / "plugin_manifest.json"
 USER_FOLDER = Path(os.path.expanduser("~"))
 SYSTEM = system()
 if SYSTEM == "Linux":
@@ -18,15 +18,22 @@ from playsound import playsound
 from tkinterdnd2 import Tk
 
 from app_utils.audio_utils import AudioDownloader
+from app_utils.batch_define import BatchDefiner, DefinitionResult
 from app_utils.cards import Card
 from app_utils.cards import Deck, SentenceFetcher, SavedDataDeck, CardStatus
 from app_utils.cards import WebCardGenerator, LocalCardGenerator
 from app_utils.error_handling import create_exception_message
 from app_utils.error_handling import error_handler
 from app_utils.global_bindings import Binder
+from app_utils.image_cache import ImageCache
 from app_utils.image_utils import ImageSearch
+from app_utils.journal import atomic_json_dump, get_journal_path
+from app_utils.prefetching import Prefetcher
+from app_utils.prefetching import prime_image_generator, resume_image_generator
+from app_utils.prefetching import prime_sentence_generator, resume_sentence_generator
 from app_utils.search_checker import ParsingException
 from app_utils.search_checker import get_card_filter
+from app_utils.string_utils import SearchType, get_search_pattern
 from app_utils.string_utils import remove_special_chars
 from app_utils.widgets import EntryWithPlaceholder as Entry
 from app_utils.widgets import ScrolledFrame
@@ -37,10 +44,17 @@ from consts.card_fields import FIELDS
 from consts.paths import *
 from plugins_loading.containers import LanguagePackageContainer
 from plugins_loading.factory import loaded_plugins
-from plugins_management.config_management import LoadableConfig, Config
+from plugins_management.config_management import LoadableConfig, Config, config_store
+from plugins_management.parsers_return_types import ImageGenerator, SentenceGenerator
 
 
 class App(Tk):
+    # how often (in ms) deck journal is checked and how large it has to be to be compacted into the deck file
+    DECK_COMPACTION_INTERVAL = 5 * 60 * 1000
+    DECK_JOURNAL_COMPACTION_SIZE = 2 ** 20
+    # how often (in ms) changed configs are written to disk
+    CONFIG_FLUSH_INTERVAL = 10 * 1000
+
     def __init__(self, *args, **kwargs):
         super(App, self).__init__(*args, **kwargs)
 
@@ -113,10 +127,13 @@ class App(Tk):
         self.dict_card_data: dict = {}
         self.sentence_batch_size = 5
         self.sentence_parser = loaded_plugins.get_sentence_parser(self.configurations["scrappers"]["sentence"]["name"])
-        self.sentence_fetcher = SentenceFetcher(sent_fetcher=self.sentence_parser.get_sentence_batch,
+        self.sentence_fetcher = SentenceFetcher(sent_fetcher=self.get_sentence_batch,
                                                 sentence_batch_size=self.sentence_batch_size)
 
         self.image_parser = loaded_plugins.get_image_parser(self.configurations["scrappers"]["image"]["name"])
+        self.image_cache = ImageCache(store_path=str(IMAGE_CACHE_PATH),
+                                      max_size=self.configurations["image_search"]["cache_size"] * 2 ** 20)
+        self.prefetcher = Prefetcher()
 
         if (local_audio_getter_name := self.configurations["scrappers"]["audio"]["name"]):
             if self.configurations["scrappers"]["audio"]["type"] == "local":
@@ -130,7 +147,8 @@ class App(Tk):
         else:
             self.audio_getter = None
 
-        self.saved_cards_data = SavedDataDeck()
+        self.saved_cards_data = SavedDataDeck(
+            journal_path=get_journal_path(self.configurations["directories"]["last_open_file"], "saved"))
         self.deck_saver = loaded_plugins.get_deck_saving_formats(self.configurations["deck"]["saving_format"])
         self.audio_saver = loaded_plugins.get_deck_saving_formats("json_deck_audio")
         self.buried_saver = loaded_plugins.get_deck_saving_formats("json_deck_cards")
@@ -155,6 +173,7 @@ class App(Tk):
         main_menu.add_cascade(label=self.lang_pack.file_master_menu_label, menu=filemenu)
 
         main_menu.add_command(label=self.lang_pack.add_card_menu_label, command=self.add_word_dialog)
+        main_menu.add_command(label=self.lang_pack.add_words_menu_label, command=self.batch_define_dialog)
         main_menu.add_command(label=self.lang_pack.search_inside_deck_menu_label, command=self.find_dialog)
         main_menu.add_command(label=self.lang_pack.statistics_menu_label, command=self.statistics_dialog)
 
@@ -275,6 +294,12 @@ saving_image_height
     Maximum saving image height to which image would be scaled
     type: integer | null
     no scaling if null
+
+cache_size
+    Maximum size (in megabytes) of downloaded images and thumbnails kept on disk.
+    Least recently shown images are removed first
+    type: integer
+    default: 128
 """
 
             def get_image_search_conf() -> Config:
@@ -288,6 +313,7 @@ saving_image_height
             def save_image_search_conf(config):
                 for key, value in config.items():
                     self.configurations["image_search"][key] = value
+                self.image_cache.set_max_size(self.configurations["image_search"]["cache_size"] * 2 ** 20)
 
             image_search_configuration_button = self.Button(settings_window,
                                                             text="</>",
@@ -506,6 +532,8 @@ saving_image_height
         self.refresh()
         self.geometry(self.configurations["app"]["main_window_geometry"])
         self.configure()
+        self.after(App.DECK_COMPACTION_INTERVAL, self.compact_deck_journal)
+        self.after(App.CONFIG_FLUSH_INTERVAL, self.flush_configs)
 
     def show_window(self, title: str, text: str) -> Toplevel:
         text_window = self.Toplevel(self)
@@ -544,6 +572,13 @@ saving_image_height
                 "audio": {
                     "type": ("default", [str], ["default", "web", "local"]),
                     "name": ("", [str], [])
+                },
+                "prefetch": {
+                    "n_cards": (3, [int], [])
+                },
+                "batch_define": {
+                    "max_workers":   (4, [int], []),
+                    "request_delay": (300, [int], [])
                 }
             },
             "anki": {
@@ -569,7 +604,8 @@ saving_image_height
                 "show_image_width":    (250, [int, type(None)], []),
                 "show_image_height":   (None, [int, type(None)], []),
                 "n_images_in_row":     (3, [int], []),
-                "n_rows":              (2, [int], [])
+                "n_rows":              (2, [int], []),
+                "cache_size":          (128, [int], [])
             },
             "deck": {
                 "tags_hierarchical_pref": ("", [str], []),
@@ -653,10 +689,11 @@ saving_image_height
         if self.history.get(new_file_path) is None:
             self.history[new_file_path] = -1
 
+        self.close_journals()
         self.deck = Deck(deck_path=self.configurations["directories"]["last_open_file"],
                          current_deck_pointer=self.history[self.configurations["directories"]["last_open_file"]],
                          card_generator=self.card_generator)
-        self.saved_cards_data = SavedDataDeck()
+        self.saved_cards_data = SavedDataDeck(journal_path=get_journal_path(new_file_path, "saved"))
         self.refresh()
 
     @error_handler(show_errors)
@@ -715,10 +752,11 @@ saving_image_height
             if self.history.get(new_file_path) is None:
                 self.history[new_file_path] = -1
 
+            self.close_journals()
             self.deck = Deck(deck_path=new_file_path,
                              current_deck_pointer=self.history[new_file_path],
                              card_generator=self.card_generator)
-            self.saved_cards_data = SavedDataDeck()
+            self.saved_cards_data = SavedDataDeck(journal_path=get_journal_path(new_file_path, "saved"))
             self.refresh()
 
         new_file_dir = askdirectory(title=self.lang_pack.create_file_choose_dir_message, initialdir="./")
@@ -747,11 +785,15 @@ saving_image_height
         self.configurations["app"]["main_window_geometry"] = self.geometry()
         self.configurations["deck"]["tags_hierarchical_pref"] = self.tag_prefix_field.get().strip()
         self.configurations.save()
+        config_store.flush(background=True)
 
         self.history[self.configurations["directories"]["last_open_file"]] = self.deck.get_pointer_position() - 1
-        self.deck.save()
-        with open(HISTORY_FILE_PATH, "w") as saving_f:
-            json.dump(self.history, saving_f, indent=4)
+        self.deck.save(background=True)
+        atomic_json_dump(self.history, str(HISTORY_FILE_PATH), indent=4)
+
+        # everything that was saved before is still on disk in saving formats
+        if not self.saved_cards_data.has_journaled_changes():
+            return
 
         deck_name = os.path.basename(self.configurations["directories"]["last_open_file"]).split(sep=".")[0]
         saving_path = "{}/{}".format(self.configurations["directories"]["last_save_dir"], deck_name)
@@ -769,6 +811,23 @@ saving_image_height
                                f"{saving_path}_{self.str_session_start}_buried",
                                self.card_processor.get_card_image_name,
                                self.card_processor.get_card_audio_name)
+        self.saved_cards_data.discard_journal()
+
+    def close_journals(self):
+        # journals of the same file must not be opened twice: compaction of one of them
+        # would replace the file under the other one
+        self.deck.close_journal()
+        self.saved_cards_data.close_journal()
+
+    @error_handler(show_errors)
+    def compact_deck_journal(self):
+        if self.deck.get_journal_size() >= App.DECK_JOURNAL_COMPACTION_SIZE:
+            self.deck.save(background=True)
+        self.after(App.DECK_COMPACTION_INTERVAL, self.compact_deck_journal)
+
+    def flush_configs(self):
+        config_store.flush(background=True)
+        self.after(App.CONFIG_FLUSH_INTERVAL, self.flush_configs)
 
     @error_handler(show_errors)
     def help_command(self):
@@ -811,7 +870,7 @@ saving_image_height
         audio_downloader = AudioDownloader(master=self,
                                            headers=self.headers,
                                            timeout=1,
-                                           request_delay=3_000,
+                                           request_delay=300,
                                            temp_dir="./temp/",
                                            saving_dir=self.configurations["directories"]["media_dir"],
                                            toplevel_cfg=self.theme.toplevel_cfg,
@@ -843,7 +902,7 @@ saving_image_height
     @error_handler(show_errors)
     def define_word(self, word_query: str, additional_query: str) -> bool:
         try:
-            exact_pattern = re.compile(r"\b{}\b".format(word_query), re.IGNORECASE)
+            exact_pattern = get_search_pattern(word_query, SearchType.EXACT, case_sensitive=False)
         except re.error:
             messagebox.showerror(title=self.lang_pack.error_title,
                                  message=self.lang_pack.define_word_wrong_regex_message)
@@ -854,7 +913,8 @@ saving_image_height
             additional_filter = get_card_filter(additional_query) if additional_query else None
             if self.deck.add_card_to_deck(query=word_query,
                                           word_filter=exact_word_filter,
-                                          additional_filter=additional_filter):
+                                          additional_filter=additional_filter,
+                                          search_type=SearchType.EXACT):
                 self.refresh()
                 return False
             messagebox.showerror(title=self.lang_pack.error_title,
@@ -905,6 +965,127 @@ saving_image_height
         add_word_window.resizable(0, 0)
         add_word_window.grab_set()
 
+    @error_handler(show_errors)
+    def define_words(self, words: list[str], additional_query: str) -> bool:
+        """
+        Defines words in background and adds all found cards in front of the current card
+        :return: whether words were not accepted
+        """
+        try:
+            additional_filter = get_card_filter(additional_query) if additional_query else None
+        except ParsingException as e:
+            messagebox.showerror(title=self.lang_pack.error_title,
+                                 message=str(e))
+            return True
+
+        card_generator = self.card_generator
+
+        def get_cards(word: str) -> list[Card]:
+            exact_pattern = get_search_pattern(word, SearchType.EXACT, case_sensitive=False)
+            return card_generator.get(query=word,
+                                      word_filter=lambda comparable: re.search(exact_pattern, comparable),
+                                      additional_filter=additional_filter,
+                                      search_type=SearchType.EXACT)
+
+        @error_handler(self.show_errors)
+        def add_definitions(definitions: list[DefinitionResult]):
+            cards = []
+            not_found = []
+            errors = []
+            for word, word_cards, error in definitions:
+                if error is not None:
+                    errors.append(f"{word}: {error}")
+                elif not word_cards:
+                    not_found.append(word)
+                else:
+                    cards.extend(word_cards)
+
+            if self.deck.add_cards_to_deck(cards):
+                self.refresh()
+            if not_found or errors:
+                message = ""
+                if not_found:
+                    message += f"{self.lang_pack.batch_define_not_found_message_prefix}: {', '.join(not_found)}\n"
+                if errors:
+                    message += f"{self.lang_pack.batch_define_errors_message_prefix}:\n" + "\n".join(errors)
+                messagebox.showerror(title=self.lang_pack.error_title, message=message)
+
+        batch_define_conf = self.configurations["scrappers"]["batch_define"]
+        definer = BatchDefiner(master=self,
+                               get_cards=get_cards,
+                               on_done=add_definitions,
+                               lang_pack=self.lang_pack,
+                               max_workers=batch_define_conf["max_workers"],
+                               # local dictionaries don't need politeness
+                               request_delay=batch_define_conf["request_delay"]
+                                             if isinstance(card_generator, WebCardGenerator) else 0,
+                               rate_limit_key=self.typed_word_parser_name,
+                               toplevel_cfg=self.theme.toplevel_cfg,
+                               pb_cfg={"length": self.winfo_width()},
+                               label_cfg=self.theme.label_cfg)
+        definer.define(words)
+        return False
+
+    @error_handler(show_errors)
+    def batch_define_dialog(self):
+        @error_handler(self.show_errors)
+        def load_words_file():
+            words_file_path = askopenfilename(title=self.lang_pack.batch_define_choose_file_title,
+                                              filetypes=(("Text", ".txt"), ("All files", "*")),
+                                              initialdir="./")
+            if not words_file_path:
+                return
+            with open(words_file_path, "r", encoding="UTF-8") as words_file:
+                words_text.clear()
+                words_text.insert(1.0, words_file.read())
+
+        @error_handler(self.show_errors)
+        def start_defining():
+            # repeated words are defined once
+            words = list(dict.fromkeys(word for line in words_text.get(1.0, "end").splitlines()
+                                       if (word := line.strip())))
+            if not words:
+                messagebox.showerror(title=self.lang_pack.error_title,
+                                     message=self.lang_pack.batch_define_empty_words_message)
+                return
+            additional_query = additional_filter_entry.get(1.0, "end").strip()
+            if not self.define_words(words, additional_query):
+                batch_define_window.destroy()
+
+        batch_define_window = self.Toplevel(self)
+        batch_define_window.withdraw()
+
+        batch_define_window.grid_columnconfigure(0, weight=1)
+        batch_define_window.title(self.lang_pack.batch_define_window_title)
+
+        words_text = self.Text(batch_define_window,
+                               placeholder=self.lang_pack.batch_define_words_placeholder,
+                               height=15)
+        words_text.focus()
+        words_text.grid(row=0, column=0, columnspan=2, padx=5, pady=3, sticky="we")
+
+        additional_filter_entry = self.Text(batch_define_window,
+                                            placeholder=self.lang_pack.add_word_additional_filter_entry_placeholder,
+                                            height=5)
+        additional_filter_entry.grid(row=1, column=0, columnspan=2, padx=5, pady=3, sticky="we")
+
+        open_file_button = self.Button(batch_define_window,
+                                       text=self.lang_pack.batch_define_open_file_button_text,
+                                       command=load_words_file)
+        open_file_button.grid(row=2, column=0, padx=5, pady=3, sticky="ns")
+
+        start_button = self.Button(batch_define_window,
+                                   text=self.lang_pack.batch_define_start_button_text,
+                                   command=start_defining)
+        start_button.grid(row=2, column=1, padx=5, pady=3, sticky="ns")
+
+        batch_define_window.bind("<Escape>", lambda event: batch_define_window.destroy())
+        batch_define_window.deiconify()
+        spawn_window_in_center(master=self, toplevel_widget=batch_define_window,
+                               desired_window_width=self.winfo_width())
+        batch_define_window.resizable(0, 0)
+        batch_define_window.grab_set()
+
     @error_handler(show_errors)
     def find_dialog(self):
         @error_handler(self.show_errors)
@@ -1045,7 +1226,10 @@ saving_image_height
         if messagebox.askokcancel(title=self.lang_pack.on_closing_message_title,
                                   message=self.lang_pack.on_closing_message):
             self.save_files()
+            self.close_journals()
+            config_store.flush()
             self.gb.stop()
+            self.prefetcher.shutdown()
             self.download_audio(closing=True)
     
     @error_handler(show_errors)
@@ -1115,6 +1299,7 @@ saving_image_height
             if not config_errors:
                 plugin_config.data = json_new_config
                 saving_action(plugin_config)
+                self.prefetcher.clear()
                 conf_window.destroy()
                 messagebox.showinfo(message=self.lang_pack.configuration_window_saved_message)
                 return
@@ -1325,10 +1510,61 @@ saving_image_height
     @error_handler(show_errors)
     def change_sentence_parser(self, given_sentence_parser_name: str):
         self.sentence_parser = loaded_plugins.get_sentence_parser(given_sentence_parser_name)
-        self.sentence_fetcher = SentenceFetcher(sent_fetcher=self.sentence_parser.get_sentence_batch,
+        self.sentence_fetcher = SentenceFetcher(sent_fetcher=self.get_sentence_batch,
                                                 sentence_batch_size=self.sentence_batch_size)
         self.configurations["scrappers"]["sentence"]["name"] = given_sentence_parser_name
-    
+
+    def get_sentence_batch(self, word: str, size: int) -> SentenceGenerator:
+        return resume_sentence_generator(
+            self.prefetcher.pop(("sentences", self.sentence_parser.name, word, size),
+                                prime_sentence_generator, self.sentence_parser.get_sentence_batch, word, size))
+
+    def get_image_links(self, word: str) -> ImageGenerator:
+        return resume_image_generator(
+            self.prefetcher.pop(("images", self.image_parser.name, word),
+                                prime_image_generator, self.image_parser.get_image_links, word))
+
+    def get_local_audios(self, word: str, dict_tags: dict) -> list[str]:
+        return self.prefetcher.get(("local_audios", self.audio_getter.name, word, repr(dict_tags)),
+                                   self.audio_getter.get_local_audios, word, dict_tags)
+
+    def get_web_audios(self, word: str, dict_tags: dict) -> tuple[tuple[list[str], list[str]], str]:
+        return self.prefetcher.get(("web_audios", self.audio_getter.name, word, repr(dict_tags)),
+                                   self.audio_getter.get_web_audios, word, dict_tags)
+
+    def prefetch_cards(self) -> None:
+        """
+        Starts fetching audios and image links of the current card and of the next ones.
+        Sentences of the current card are already consumed by refresh, so they are fetched only for the next cards
+        """
+        cards = [self.deck.get_pointed_item(),
+                 *self.deck.get_next_cards(self.configurations["scrappers"]["prefetch"]["n_cards"])]
+        scheduled_keys = []
+        for i, card in enumerate(cards):
+            if not (word := card.get(FIELDS.word, "")):
+                continue
+            dict_tags = card.get(FIELDS.dict_tags, {})
+            dict_tags = dict_tags if isinstance(dict_tags, dict) else dict_tags.to_dict()
+
+            tasks = [(("images", self.image_parser.name, word),
+                      prime_image_generator, self.image_parser.get_image_links, word)]
+            if i:
+                tasks.append((("sentences", self.sentence_parser.name, word, self.sentence_batch_size),
+                              prime_sentence_generator, self.sentence_parser.get_sentence_batch, word,
+                              self.sentence_batch_size))
+            if self.audio_getter is not None:
+                if self.configurations["scrappers"]["audio"]["type"] == "local":
+                    tasks.append((("local_audios", self.audio_getter.name, word, repr(dict_tags)),
+                                  self.audio_getter.get_local_audios, word, dict_tags))
+                elif self.configurations["scrappers"]["audio"]["type"] == "web":
+                    tasks.append((("web_audios", self.audio_getter.name, word, repr(dict_tags)),
+                                  self.audio_getter.get_web_audios, word, dict_tags))
+
+            for key, function, *args in tasks:
+                self.prefetcher.schedule(key, function, *args)
+                scheduled_keys.append(key)
+        self.prefetcher.retain(scheduled_keys)
+
     @error_handler(show_errors)
     def choose_sentence(self, sentence_number: int):
         word = self.word
@@ -1348,7 +1584,7 @@ saving_image_height
 
         if self.audio_getter is not None:
             if self.configurations["scrappers"]["audio"]["type"] == "local" and \
-                    (local_audios := self.audio_getter.get_local_audios(word, dict_tags)):
+                    (local_audios := self.get_local_audios(word, dict_tags)):
                 additional[SavedDataDeck.AUDIO_DATA] = {}
                 additional[SavedDataDeck.AUDIO_DATA][SavedDataDeck.AUDIO_SRCS] = local_audios
                 additional[SavedDataDeck.AUDIO_DATA][SavedDataDeck.AUDIO_SRCS_TYPE] = SavedDataDeck.AUDIO_SRC_TYPE_LOCAL
@@ -1364,7 +1600,7 @@ saving_image_height
                     for i in range(len(local_audios))
                 ]
             elif self.configurations["scrappers"]["audio"]["type"] == "web" and \
-                    not (web_audio_data := self.audio_getter.get_web_audios(word, dict_tags))[1]:
+                    not (web_audio_data := self.get_web_audios(word, dict_tags))[1]:
                 ((web_audio_links, additional_data), error_message) = web_audio_data
                 additional[SavedDataDeck.AUDIO_DATA] = {}
                 additional[SavedDataDeck.AUDIO_DATA][SavedDataDeck.AUDIO_SRCS] = [web_audio_links[0]]
@@ -1476,11 +1712,11 @@ saving_image_height
         dict_tags = self.dict_card_data.get(FIELDS.dict_tags, {})
         if self.audio_getter is not None:
             if self.configurations["scrappers"]["audio"]["type"] == "local":
-                audio_sources = self.audio_getter.get_local_audios(word, dict_tags)
+                audio_sources = self.get_local_audios(word, dict_tags)
                 playsound_function = local_playsound
                 additional_info = audio_sources
             elif self.configurations["scrappers"]["audio"]["type"] == "web":
-                ((audio_sources, additional_info), error_message) = self.audio_getter.get_web_audios(word, dict_tags)
+                ((audio_sources, additional_info), error_message) = self.get_web_audios(word, dict_tags)
                 if error_message:
                     messagebox.showerror(title=self.lang_pack.error_title,
                                          message=error_message)
@@ -1518,10 +1754,11 @@ saving_image_height
             def request_anki(action, **params):
                 return {'action': action, 'params': params, 'version': 6}
             import requests
+            from plugins_management.http_sessions import session_registry
 
             request_json = json.dumps(request_anki(action, **params)).encode('utf-8')
             try:
-                res = requests.get("http://localhost:8765", data=request_json, timeout=1)
+                res = session_registry.get("http://localhost:8765", data=request_json, timeout=1)
                 res.raise_for_status()
             except requests.ConnectionError:
                 messagebox.showerror(title=self.lang_pack.error_title,
@@ -1580,6 +1817,9 @@ saving_image_height
             widget["state"] = "disabled"
 
         self.dict_card_data = self.deck.get_card().to_dict()
+        # decisions about cards are journaled by saved_cards_data right before refresh,
+        # so the position has to be journaled at once for them to match after a crash
+        self.deck.flush_pointer()
         self.card_processor.process_card(self.dict_card_data)
 
         self.prev_button["state"] = "normal" if self.deck.get_pointer_position() != self.deck.get_starting_position() + 1 \
@@ -1600,6 +1840,7 @@ saving_image_height
 
         self.sentence_fetcher(self.word, self.dict_card_data.get(FIELDS.sentences, []))
         self.replace_sentences()
+        self.prefetch_cards()
         if not self.dict_card_data:
             # normal
             self.find_image_button["text"] = self.lang_pack.find_image_button_normal_text
@@ -1644,7 +1885,7 @@ saving_image_height
                                                      instance.images_source[i],
                                                      self.configurations["scrappers"]["image"]["name"],
                                                      dict_tags))
-                    instance.preprocess_image(img=instance.saving_images[i],
+                    instance.preprocess_image(img=instance.get_saving_image(i),
                                               width=self.configurations["image_search"]["saving_image_width"],
                                               height=self.configurations["image_search"]["saving_image_height"])\
                             .save(saving_name)
@@ -1665,13 +1906,14 @@ saving_image_height
                                    main_params=self.theme.toplevel_cfg,
                                    search_term=word,
                                    saving_dir=self.configurations["directories"]["media_dir"],
-                                   url_scrapper=self.image_parser.get_image_links,
+                                   url_scrapper=self.get_image_links,
                                    init_urls=self.dict_card_data
                                                  .get(FIELDS.img_links, []),
                                    local_images=self.dict_card_data
                                                     .get(SavedDataDeck.ADDITIONAL_DATA, {})
                                                     .get(self.saved_cards_data.SAVED_IMAGES_PATHS, []),
                                    headers=self.headers,
+                                   image_cache=self.image_cache,
                                    timeout=self.configurations["image_search"]["timeout"],
                                    max_request_tries=self.configurations["image_search"]["max_request_tries"],
                                    n_images_in_row=self.configurations["image_search"]["n_images_in_row"],
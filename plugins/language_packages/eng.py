@@ -16,6 +16,7 @@ change_media_folder_menu_label = "Change downloading media directory"
 file_master_menu_label = "File"
 
 add_card_menu_label = "Add"
+add_words_menu_label = "Add list"
 search_inside_deck_menu_label = "Find"
 statistics_menu_label = "Statistics"
 settings_themes_label_text = "Theme"
@@ -307,6 +308,17 @@ add_word_entry_placeholder = "Word"
 add_word_additional_filter_entry_placeholder = "Additional filter"
 add_word_start_parsing_button_text = "Add"
 
+# batch define dialog
+batch_define_window_title = "Add list of words"
+batch_define_words_placeholder = "Words (one per line)"
+batch_define_open_file_button_text = "From file"
+batch_define_choose_file_title = "Choose file with words"
+batch_define_start_button_text = "Add"
+batch_define_empty_words_message = "No words to add!"
+batch_define_progress_title = "Defining words..."
+batch_define_not_found_message_prefix = "Not found"
+batch_define_errors_message_prefix = "Failed"
+
 # find dialog
 find_dialog_empty_query_message = "Empty query!"
 find_dialog_wrong_move_message = "Wrong move expression!"
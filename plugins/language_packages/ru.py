@@ -16,6 +16,7 @@ change_media_folder_menu_label = "Сменить пользователя"
 file_master_menu_label = "Файл"
 
 add_card_menu_label = "Добавить"
+add_words_menu_label = "Добавить список"
 search_inside_deck_menu_label = "Перейти"
 statistics_menu_label = "Статистика"
 settings_themes_label_text = "Тема"
@@ -307,6 +308,17 @@ add_word_entry_placeholder = "Слово"
 add_word_additional_filter_entry_placeholder = "Дополнительный фильтр"
 add_word_start_parsing_button_text = "Добавить"
 
+# batch define dialog
+batch_define_window_title = "Добавить список слов"
+batch_define_words_placeholder = "Слова (по одному на строке)"
+batch_define_open_file_button_text = "Из файла"
+batch_define_choose_file_title = "Выберите файл со словами"
+batch_define_start_button_text = "Добавить"
+batch_define_empty_words_message = "Нет слов для добавления!"
+batch_define_progress_title = "Ищу слова..."
+batch_define_not_found_message_prefix = "Не найдено"
+batch_define_errors_message_prefix = "Ошибки"
+
 # find dialog
 find_dialog_empty_query_message = "Пустой запрос!"
 find_dialog_wrong_move_message = "Неверно задан переход!"
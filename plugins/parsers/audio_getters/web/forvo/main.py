@@ -18,11 +18,16 @@ language_code
 timeout
     request timeout in seconds.
     default value: 1
+
+cache_ttl
+    how long (in seconds) downloaded pages are reused. 0 disables caching
+    default value: 2592000
 """
 
 _VALIDATION_SCHEME = {
     "language_code": ("en", [str], []),
-    "timeout": (1, [int, float], [])
+    "timeout": (1, [int, float], []),
+    "cache_ttl": (2592000, [int, float], [])
 }
 
 config = LoadableConfig(config_location=_PLUGIN_LOCATION,
@@ -34,7 +39,7 @@ def get_web_audios(word: str, dict_tags: dict) -> tuple[tuple[list[str], list[st
     audio_links = []
     additional_info = []
     wordEncoded = requests.utils.requote_uri(word)
-    forvoPage, error_message = get_forvo_page("https://forvo.com/word/" + wordEncoded, config["timeout"])
+    forvoPage, error_message = get_forvo_page("https://forvo.com/word/" + wordEncoded, config["timeout"], config["cache_ttl"])
     if error_message:
         return (([], []), error_message)
     speachSections = forvoPage.select("div#language-container-" + config["language_code"])
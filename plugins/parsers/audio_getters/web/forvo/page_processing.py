@@ -4,12 +4,13 @@ from typing import Optional
 import requests
 from bs4 import BeautifulSoup
 
+from plugins_management.web_cache import web_cache
 from .consts import _HEADERS, _PLUGIN_NAME
 
 
-def get_forvo_page(url: str, timeout: int = 1) -> tuple[Optional[BeautifulSoup], str]:
+def get_forvo_page(url: str, timeout: int = 1, cache_ttl: float = 0) -> tuple[Optional[BeautifulSoup], str]:
     try:
-        r = requests.get(url, headers=_HEADERS)
+        r = web_cache.get(url, ttl=cache_ttl, headers=_HEADERS, timeout=timeout)
         r.raise_for_status()
         decoded_page_content = r.content.decode('UTF-8')
     except requests.RequestException as e:
@@ -6,11 +6,13 @@ import bs4
 import requests
 from plugins_management.config_management import LoadableConfig
 from plugins_management.parsers_return_types import ImageGenerator
+from plugins_management.web_cache import web_cache
 
 FILE_PATH = os.path.basename(__file__)
 
 _CONF_VALIDATION_SCHEME = {
-    "timeout": (1, [int, float], [])
+    "timeout": (1, [int, float], []),
+    "cache_ttl": (86400, [int, float], [])
 }
 
 _CONF_DOCS = """
@@ -18,6 +20,11 @@ timeout:
     Request timeout in seconds
     type: integer
     default value: 1
+
+cache_ttl:
+    How long (in seconds) downloaded pages are reused. 0 disables caching
+    type: integer, float
+    default value: 86400
 """
 
 config = LoadableConfig(config_location=os.path.dirname(__file__),
@@ -31,7 +38,7 @@ def get_image_links(word: str) -> ImageGenerator:
                  "Chrome/70.0.3538.67 Safari/537.36"
     headers = {'User-Agent': user_agent}
     try:
-        r = requests.get(link, headers=headers, timeout=config["timeout"])
+        r = web_cache.get(link, ttl=config["cache_ttl"], headers=headers, timeout=config["timeout"])
         r.raise_for_status()
     except requests.RequestException:
         return [], f"{FILE_PATH} couldn't get a web page!"
@@ -5,11 +5,13 @@ import requests
 
 from plugins_management.config_management import LoadableConfig
 from plugins_management.parsers_return_types import SentenceGenerator
+from plugins_management.web_cache import web_cache
 
 FILE_PATH = os.path.split(os.path.dirname(__file__))[-1]
 
 _CONF_VALIDATION_SCHEME = {
-    "timeout": (1, [int, float], [])
+    "timeout": (1, [int, float], []),
+    "cache_ttl": (2592000, [int, float], [])
 }
 
 _CONF_DOCS = """
@@ -17,6 +19,11 @@ timeout:
     Request timeout in seconds
     type: integer, float
     default value: 1
+
+cache_ttl:
+    How long (in seconds) downloaded pages are reused. 0 disables caching
+    type: integer, float
+    default value: 2592000
 """
 
 config = LoadableConfig(config_location=os.path.dirname(__file__),
@@ -26,8 +33,9 @@ config = LoadableConfig(config_location=os.path.dirname(__file__),
 
 def get_sentence_batch(word: str, size: int = 5) -> SentenceGenerator:
     try:
-        page = requests.get(f"https://searchsentences.com/words/{word}-in-a-sentence",
-                            timeout=config["timeout"])
+        page = web_cache.get(f"https://searchsentences.com/words/{word}-in-a-sentence",
+                             ttl=config["cache_ttl"],
+                             timeout=config["timeout"])
         page.raise_for_status()
     except requests.RequestException as e:
         yield [], f"{FILE_PATH} couldn't get a web page: {e}"
@@ -23,12 +23,18 @@ timeout
     Request timeout in seconds
     type: integer | float
     default value: 1
+
+cache_ttl
+    How long (in seconds) downloaded pages are reused. 0 disables caching
+    type: integer | float
+    default value: 2592000
 """
 
 _CONF_VALIDATION_SCHEME = \
     {
         "audio_region": ("us", [str], ["us", "uk"]),
-        "timeout": (1, [int, float], [])
+        "timeout": (1, [int, float], []),
+        "cache_ttl": (2592000, [int, float], [])
     }
 
 config = LoadableConfig(config_location=os.path.dirname(__file__),
@@ -72,4 +78,4 @@ def translate(word: str, word_dict: dict):
 
 
 def define(word: str) -> list[tuple[str, dict]]:
-    return _define(word=word, timeout=config["timeout"])
+    return _define(word=word, timeout=config["timeout"], cache_ttl=config["cache_ttl"])
@@ -1,11 +1,16 @@
 import bs4
-import requests
+
+from plugins_management.web_cache import web_cache
 
 
 REQUESTS_HEADER = {'User-Agent': 'Mozilla/5.0 (Windows NT 6.1; Win64; x64)'}
 LINK_PREFIX = "https://dictionary.cambridge.org"
 
 
+# classes of get_tags results in the order they are returned
+_TAG_CLASSES = ("epp-xref", "gram dgram", "region dregion", "usage dusage", "domain ddomain")
+
+
 def get_tags(tags_section) -> [list, list, list, list, list]:
     """
     :param block:  "span", {"class": "def-info ddef-info"}
@@ -16,28 +21,28 @@ def get_tags(tags_section) -> [list, list, list, list, list]:
     usage - formal/informal/specialized
     domain - domain of usage of word
     """
+    found_tags = tuple([] for _ in _TAG_CLASSES)
+    if tags_section is None:
+        return found_tags
+
+    # one pass over the section instead of one per tag class
+    for tag in tags_section.find_all("span", class_=True):
+        tag_classes = tag.get("class")
+        joined_tag_classes = " ".join(tag_classes)
+        # same matching as of find_all("span", {"class": ...})
+        matched = [i for i, tag_class in enumerate(_TAG_CLASSES)
+                   if tag_class == joined_tag_classes or tag_class in tag_classes]
+        if not matched:
+            continue
 
-    def find_all_tags(html_tag: str, params: dict) -> list:
-        tags = []
-        if tags_section is None:
-            return tags
-
-        found_tags = tags_section.find_all(html_tag, params)
-        for tag in found_tags:
-            tag_grandparent = tag.parent.parent.get("class")
-            # var - var dvar; group - inf-group dinfg
-            if not any("var" in x or "group" in x for x in tag_grandparent):
-                tag_text = tag.text.strip()
-                if tag_text:
-                    tags.append(tag_text)
-        return tags
-
-    level = find_all_tags("span", {"class": "epp-xref"})
-    labels_and_codes = find_all_tags("span", {"class": "gram dgram"})
-    region = find_all_tags("span", {"class": "region dregion"})
-    usage = find_all_tags("span", {"class": "usage dusage"})
-    domain = find_all_tags("span", {"class": "domain ddomain"})
-    return level, labels_and_codes, region, usage, domain
+        tag_grandparent = tag.parent.parent.get("class", ())
+        # var - var dvar; group - inf-group dinfg
+        if any("var" in x or "group" in x for x in tag_grandparent):
+            continue
+        if (tag_text := tag.text.strip()):
+            for i in matched:
+                found_tags[i].append(tag_text)
+    return found_tags
 
 
 def get_phonetics(header_block, dictionary_index=0) -> tuple[list[str], list[str], list[str], list[str]]:
@@ -195,25 +200,49 @@ def get_alt_terms(word_header_block) -> list[str]:
     return alt_terms
 
 
-def define(word, dictionary_index=0, headers=None, timeout=5):
+# everything outside of these blocks is skipped while parsing
+_SUPERENTRY_STRAINER = bs4.SoupStrainer("div", {"class": "pr di superentry"})
+
+
+def fetch_page(word, headers=None, timeout=5, cache_ttl=0) -> bytes:
+    """
+    :param word: word to be parsed
+    :param headers: request headers
+    :param cache_ttl: how long (in seconds) a cached page can be reused
+    """
+    if headers is None:
+        headers = REQUESTS_HEADER
+
+    link = f"{LINK_PREFIX}/dictionary/english/{word}"
+    # will raise error if headers are None
+    return web_cache.get(link, ttl=cache_ttl, headers=headers, timeout=timeout).content
+
+
+def define(word, dictionary_index=0, headers=None, timeout=5, cache_ttl=0):
     """
     :param word: word to be parsed
     :param headers: request headers
+    :param cache_ttl: how long (in seconds) a cached page can be reused
     :param dictionary_index:
         * 0 - English dictionary (Also used to search Idioms);
         * 1 - American dictionary;
         * 2 - Business dictionary
     :return:
     """
-    if headers is None:
-        headers = REQUESTS_HEADER
+    return parse_page(fetch_page(word, headers=headers, timeout=timeout, cache_ttl=cache_ttl), dictionary_index)
 
-    link = f"{LINK_PREFIX}/dictionary/english/{word}"
-    # will raise error if headers are None
-    page = requests.get(link, headers=headers, timeout=timeout)
+
+def parse_page(page_content: bytes, dictionary_index=0):
+    """
+    Builds tree of dictionary blocks only, instead of the whole page
+    """
+    return parse_soup(bs4.BeautifulSoup(page_content, "html.parser", parse_only=_SUPERENTRY_STRAINER),
+                      dictionary_index)
+
+
+def parse_soup(soup: bs4.BeautifulSoup, dictionary_index=0):
     word_info = {}
 
-    soup = bs4.BeautifulSoup(page.content, "html.parser")
     # Only english dictionary
     # word block which contains definitions for every POS.
     primal_block = soup.find_all("div", {'class': 'pr di superentry'})
@@ -329,9 +358,3 @@ def define(word, dictionary_index=0, headers=None, timeout=5):
                              uk_audio_links=uk_audio_links,
                              us_audio_links=us_audio_links)
     return list(word_info.items())
-
-
-if __name__ == "__main__":
-    from pprint import pprint
-
-    pprint(define("larynx"))
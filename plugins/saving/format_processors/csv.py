@@ -1,26 +1,22 @@
 import csv
-from typing import Callable
+from functools import partial
+from typing import Callable, Iterator
 
 from app_utils.cards import CardStatus
+from app_utils.cards import TagRenderer
 from app_utils.cards import SavedDataDeck
 from app_utils.string_utils import remove_special_chars
 from consts.card_fields import FIELDS
 
 
-def save(deck: SavedDataDeck,
-         saving_card_status: CardStatus,
-         saving_path: str,
-         image_names_wrapper: Callable[[str], str],
-         audio_names_wrapper: Callable[[str], str]):
-    if not deck.get_card_status_stats(saving_card_status):
-        return
+def _iter_rows(deck: SavedDataDeck,
+               saving_card_status: CardStatus,
+               image_names_wrapper: Callable[[str], str],
+               audio_names_wrapper: Callable[[str], str]) -> Iterator[list[str]]:
+    # the same dictionary tags repeat across cards, so each one is cleaned once per export
+    tag_renderer = TagRenderer(sep="::", tag_processor=partial(remove_special_chars, sep="_"))
 
-    csv_file = open(saving_path + ".csv", 'w', encoding="UTF-8")
-    cards_writer = csv.writer(csv_file, delimiter=';', quotechar='"', quoting=csv.QUOTE_MINIMAL)
-
-    for card_page in deck:
-        if card_page[SavedDataDeck.CARD_STATUS] != saving_card_status:
-            continue
+    for card_page in deck.iter_card_pages(saving_card_status):
         card_data = card_page[SavedDataDeck.CARD_DATA]
 
         images = ""
@@ -35,15 +31,24 @@ def save(deck: SavedDataDeck,
         sentence_example = card_data.get(FIELDS.sentences, [""])[0]
         saving_word = card_data.get(FIELDS.word, "")
         definition = card_data.get(FIELDS.definition, "")
-        dict_tags = card_data.get_str_dict_tags(card_data=card_data,
-                                                prefix=hierarchical_prefix,
-                                                sep="::",
-                                                tag_processor=lambda tag: remove_special_chars(tag, sep="_"))
+        dict_tags = tag_renderer.render(card_data, prefix=hierarchical_prefix)
 
         user_tags = card_data.get(SavedDataDeck.USER_TAGS, "")
         if hierarchical_prefix:
             user_tags = " ".join((f"{hierarchical_prefix}::{tag}" for tag in user_tags.split()))
         tags = f"{dict_tags} {user_tags}"
 
-        cards_writer.writerow([sentence_example, saving_word, definition, images, audios, tags])
-    csv_file.close()
+        yield [sentence_example, saving_word, definition, images, audios, tags]
+
+
+def save(deck: SavedDataDeck,
+         saving_card_status: CardStatus,
+         saving_path: str,
+         image_names_wrapper: Callable[[str], str],
+         audio_names_wrapper: Callable[[str], str]):
+    if not deck.get_card_status_stats(saving_card_status):
+        return
+
+    with open(saving_path + ".csv", 'w', encoding="UTF-8") as csv_file:
+        cards_writer = csv.writer(csv_file, delimiter=';', quotechar='"', quoting=csv.QUOTE_MINIMAL)
+        cards_writer.writerows(_iter_rows(deck, saving_card_status, image_names_wrapper, audio_names_wrapper))
@@ -1,8 +1,8 @@
-import json
+from itertools import chain
 from typing import Callable
 
 from app_utils.cards import SavedDataDeck, CardStatus
-from app_utils.storages import FrozenDictJSONEncoder
+from app_utils.storages import FrozenDictJSONEncoder, dump_json_array
 
 
 def save(deck: SavedDataDeck,
@@ -10,8 +10,8 @@ def save(deck: SavedDataDeck,
          saving_path: str,
          image_names_wrapper: Callable[[str], str],
          audio_names_wrapper: Callable[[str], str]):
-    saving_object = deck.get_audio_data(saving_card_status)
+    saving_items = deck.iter_audio_data(saving_card_status)
 
-    if saving_object:
+    if (first_item := next(saving_items, None)) is not None:
         with open(saving_path + ".json", "w", encoding="utf-8") as deck_file:
-            json.dump(saving_object, deck_file, cls=FrozenDictJSONEncoder)
+            dump_json_array(chain((first_item,), saving_items), deck_file, cls=FrozenDictJSONEncoder)
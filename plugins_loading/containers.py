@@ -47,6 +47,7 @@ class LanguagePackageContainer(_PluginContainer, LanguagePackageInterface):
         object.__setattr__(self, "file_master_menu_label", source_module.file_master_menu_label)
 
         object.__setattr__(self, "add_card_menu_label", source_module.add_card_menu_label)
+        object.__setattr__(self, "add_words_menu_label", source_module.add_words_menu_label)
         object.__setattr__(self, "search_inside_deck_menu_label", source_module.search_inside_deck_menu_label)
         object.__setattr__(self, "statistics_menu_label", source_module.statistics_menu_label)
         object.__setattr__(self, "settings_themes_label_text", source_module.settings_themes_label_text)
@@ -131,6 +132,18 @@ class LanguagePackageContainer(_PluginContainer, LanguagePackageInterface):
                            source_module.add_word_additional_filter_entry_placeholder)
         object.__setattr__(self, "add_word_start_parsing_button_text", source_module.add_word_start_parsing_button_text)
 
+        # batch define dialog
+        object.__setattr__(self, "batch_define_window_title", source_module.batch_define_window_title)
+        object.__setattr__(self, "batch_define_words_placeholder", source_module.batch_define_words_placeholder)
+        object.__setattr__(self, "batch_define_open_file_button_text", source_module.batch_define_open_file_button_text)
+        object.__setattr__(self, "batch_define_choose_file_title", source_module.batch_define_choose_file_title)
+        object.__setattr__(self, "batch_define_start_button_text", source_module.batch_define_start_button_text)
+        object.__setattr__(self, "batch_define_empty_words_message", source_module.batch_define_empty_words_message)
+        object.__setattr__(self, "batch_define_progress_title", source_module.batch_define_progress_title)
+        object.__setattr__(self, "batch_define_not_found_message_prefix",
+                           source_module.batch_define_not_found_message_prefix)
+        object.__setattr__(self, "batch_define_errors_message_prefix", source_module.batch_define_errors_message_prefix)
+
         # find dialog
         object.__setattr__(self, "find_dialog_empty_query_message", source_module.find_dialog_empty_query_message)
         object.__setattr__(self, "find_dialog_wrong_move_message", source_module.find_dialog_wrong_move_message)
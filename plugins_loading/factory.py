@@ -1,8 +1,10 @@
 import importlib
+import os
 import pkgutil
 from dataclasses import dataclass
 from types import ModuleType
-from typing import Callable
+from threading import RLock
+from typing import Callable, Iterator, Optional
 from typing import ClassVar
 from typing import TypeVar, Generic
 
@@ -16,6 +18,7 @@ import plugins.parsers.word_parsers.web
 import plugins.saving.card_processors
 import plugins.saving.format_processors
 import plugins.themes
+from consts.paths import PLUGIN_MANIFEST_PATH
 from plugins_loading.containers import CardProcessorContainer
 from plugins_loading.containers import DeckSavingFormatContainer
 from plugins_loading.containers import ImageParserContainer
@@ -28,21 +31,26 @@ from plugins_loading.containers import WebSentenceParserContainer
 from plugins_loading.containers import WebWordParserContainer
 from plugins_loading.exceptions import LoaderError
 from plugins_loading.exceptions import UnknownPluginName
+from plugins_loading.manifest import PluginManifest
+from plugins_loading.manifest import get_plugin_signature
 
 
-def parse_namespace(namespace, postfix: str = "") -> dict:
-    def iter_namespace(ns_pkg):
-        # Specifying the second argument (prefix) to iter_modules makes the
-        # returned name an absolute name instead of a relative one. This allows
-        # import_module to work without having to do additional modification to
-        # the name.
-        return pkgutil.iter_modules(ns_pkg.__path__, ns_pkg.__name__ + ".")
+def iter_namespace(namespace, postfix: str = "") -> Iterator[tuple[str, str, str]]:
+    """
+    Lists plugins of the namespace without importing them
+    :return: (plugin name, absolute name of the module to import, plugin file or directory path)
+    """
+    # Specifying the second argument (prefix) to iter_modules makes the
+    # returned name an absolute name instead of a relative one. This allows
+    # import_module to work without having to do additional modification to
+    # the name.
+    for finder, name, ispkg in pkgutil.iter_modules(namespace.__path__, namespace.__name__ + "."):
+        plugin_name = name.split(sep=".")[-1]
+        yield plugin_name, name + postfix, os.path.join(finder.path, plugin_name if ispkg else plugin_name + ".py")
+
 
-    res = {}
-    for finder, name, ispkg in iter_namespace(namespace):
-        parser_trunc_name = name.split(sep=".")[-1]
-        res[parser_trunc_name] = importlib.import_module(name + postfix)
-    return res
+def parse_namespace(namespace, postfix: str = "") -> dict:
+    return {name: importlib.import_module(module_name) for name, module_name, _ in iter_namespace(namespace, postfix)}
 
 
 PluginContainer = TypeVar("PluginContainer")
@@ -50,9 +58,22 @@ PluginContainer = TypeVar("PluginContainer")
 
 @dataclass(slots=True, init=False, frozen=True)
 class PluginLoader(Generic[PluginContainer]):
+    """
+    Plugin modules are imported on the first get of their names, so that startup doesn't pay
+    for third party imports and config files of plugins that are never used.
+    Results of loading attempts are remembered in the manifest until plugins' source files
+    (or installed packages) change
+    """
     plugin_type: str
+    _container_type: PluginContainer
+    _error_callback: Callable[[Exception, str], None]
+    _namespace: str
+    _module_names: dict[str, str]
+    _module_paths: dict[str, str]
+    _manifest: Optional[PluginManifest]
     _loaded_plugin_data: dict[str, PluginContainer]
-    not_loaded: tuple[str]
+    _not_loaded: list[str]
+    _lock: RLock
 
     _already_initialized: ClassVar[set[str]] = set()
 
@@ -61,33 +82,84 @@ class PluginLoader(Generic[PluginContainer]):
                  module: ModuleType,
                  configurable: bool,
                  container_type: PluginContainer,
-                 error_callback: Callable[[Exception, str], None] = lambda *_: None):
+                 error_callback: Callable[[Exception, str], None] = lambda *_: None,
+                 manifest: Optional[PluginManifest] = None):
         if (module_name := module.__name__) in PluginLoader._already_initialized:
             raise LoaderError(f"{module_name} loader was created earlier!")
         PluginLoader._already_initialized.add(module_name)
         object.__setattr__(self, "plugin_type", plugin_type)
+        object.__setattr__(self, "_container_type", container_type)
+        object.__setattr__(self, "_error_callback", error_callback)
+        object.__setattr__(self, "_namespace", module_name)
+        object.__setattr__(self, "_module_names", {})
+        object.__setattr__(self, "_module_paths", {})
+        for name, plugin_module_name, path in iter_namespace(module, ".main" if configurable else ""):
+            self._module_names[name] = plugin_module_name
+            self._module_paths[name] = path
+        object.__setattr__(self, "_manifest", manifest)
+        object.__setattr__(self, "_loaded_plugin_data", {})
+        object.__setattr__(self, "_not_loaded", [])
+        # reentrant because a plugin may get other plugins while being imported
+        object.__setattr__(self, "_lock", RLock())
 
-        _loaded_plugin_data = {}
-        not_loaded = []
-        namespace_parsed_results = parse_namespace(module, postfix=".main") if configurable else parse_namespace(module)
-        for name, module in namespace_parsed_results.items():
-            try:
-                _loaded_plugin_data[name] = container_type(name, module)
-            except AttributeError as e:
-                error_callback(e, name)
-                not_loaded.append(name)
-        object.__setattr__(self, "_loaded_plugin_data", _loaded_plugin_data)
-        object.__setattr__(self, "not_loaded", tuple(not_loaded))
+    @property
+    def loaded(self) -> tuple[str, ...]:
+        """
+        Names of plugins that can be loaded. Plugins that are new or changed since the manifest
+        recorded them are loaded right away to find out whether they work
+        """
+        names = []
+        for name in self._module_names:
+            if name in self._not_loaded:
+                continue
+            if self._manifest is not None and name not in self._loaded_plugin_data:
+                if (loadable := self._manifest.is_loadable(self._namespace, name, self._get_signature(name))) is None:
+                    loadable = self._load(name) is not None
+                if not loadable:
+                    continue
+            names.append(name)
+        return tuple(names)
 
     @property
-    def loaded(self):
-        return tuple(self._loaded_plugin_data)
+    def not_loaded(self) -> tuple[str, ...]:
+        return tuple(self._not_loaded)
+
+    def _get_signature(self, name: str) -> str:
+        return get_plugin_signature(self._module_paths[name])
+
+    def _load(self, name: str) -> Optional[PluginContainer]:
+        with self._lock:
+            if (value := self._loaded_plugin_data.get(name)) is not None or name in self._not_loaded:
+                return value
+            try:
+                value = self._container_type(name, importlib.import_module(self._module_names[name]))
+            # plugins are imported on demand (from UI callbacks and worker threads), so a plugin
+            # with a missing dependency has to be reported the same way as an incomplete one
+            except (AttributeError, ImportError) as e:
+                self._error_callback(e, name)
+                self._not_loaded.append(name)
+                if self._manifest is not None:
+                    self._manifest.record(self._namespace, name, self._get_signature(name), loaded=False)
+                return None
+            self._loaded_plugin_data[name] = value
+            if self._manifest is not None:
+                self._manifest.record(self._namespace, name, self._get_signature(name), loaded=True)
+            return value
 
     def get(self, name: str) -> PluginContainer:
         if (value := self._loaded_plugin_data.get(name)) is not None:
             return value
+        if name in self._module_names and (value := self._load(name)) is not None:
+            return value
         raise UnknownPluginName(f"Unknown {self.plugin_type}: {name}")
 
+    def load_all(self) -> None:
+        """
+        Imports every discovered plugin (eager loading)
+        """
+        for name in self._module_names:
+            self._load(name)
+
 
 @dataclass(slots=True, init=False, frozen=True, repr=False)
 class PluginFactory:
@@ -108,46 +180,57 @@ class PluginFactory:
         if PluginFactory._is_initialized:
             raise LoaderError(f"{self.__class__.__name__} already exists!")
         PluginFactory._is_initialized = True
+        manifest = PluginManifest(str(PLUGIN_MANIFEST_PATH))
         object.__setattr__(self, "language_packages",   PluginLoader(plugin_type="language package",
                                                                      module=plugins.language_packages,
                                                                      configurable=False,
-                                                                     container_type=LanguagePackageContainer))
+                                                                     container_type=LanguagePackageContainer,
+                                                                     manifest=manifest))
         object.__setattr__(self, "themes",              PluginLoader(plugin_type="theme",
                                                                      module=plugins.themes,
                                                                      configurable=False,
-                                                                     container_type=ThemeContainer))
+                                                                     container_type=ThemeContainer,
+                                                                     manifest=manifest))
         object.__setattr__(self, "web_word_parsers",    PluginLoader(plugin_type="web word parser",
                                                                      module=plugins.parsers.word_parsers.web,
                                                                      configurable=True,
-                                                                     container_type=WebWordParserContainer))
+                                                                     container_type=WebWordParserContainer,
+                                                                     manifest=manifest))
         object.__setattr__(self, "local_word_parsers",  PluginLoader(plugin_type="local word parser",
                                                                      module=plugins.parsers.word_parsers.local,
                                                                      configurable=True,
-                                                                     container_type=LocalWordParserContainer))
+                                                                     container_type=LocalWordParserContainer,
+                                                                     manifest=manifest))
         object.__setattr__(self, "web_sent_parsers",    PluginLoader(plugin_type="web sentence parser",
                                                                      module=plugins.parsers.sentence_parsers,
                                                                      configurable=True,
-                                                                     container_type=WebSentenceParserContainer))
+                                                                     container_type=WebSentenceParserContainer,
+                                                                     manifest=manifest))
         object.__setattr__(self, "image_parsers",       PluginLoader(plugin_type="web image parser",
                                                                      module=plugins.parsers.image_parsers,
                                                                      configurable=True,
-                                                                     container_type=ImageParserContainer))
+                                                                     container_type=ImageParserContainer,
+                                                                     manifest=manifest))
         object.__setattr__(self, "card_processors",     PluginLoader(plugin_type="card processor",
                                                                      module=plugins.saving.card_processors,
                                                                      configurable=False,
-                                                                     container_type=CardProcessorContainer))
+                                                                     container_type=CardProcessorContainer,
+                                                                     manifest=manifest))
         object.__setattr__(self, "deck_saving_formats", PluginLoader(plugin_type="deck plugins.saving format",
                                                                      module=plugins.saving.format_processors,
                                                                      configurable=False,
-                                                                     container_type=DeckSavingFormatContainer))
+                                                                     container_type=DeckSavingFormatContainer,
+                                                                     manifest=manifest))
         object.__setattr__(self, "local_audio_getters", PluginLoader(plugin_type="local audio getter",
                                                                      module=plugins.parsers.audio_getters.local,
                                                                      configurable=True,
-                                                                     container_type=LocalAudioGetterContainer))
+                                                                     container_type=LocalAudioGetterContainer,
+                                                                     manifest=manifest))
         object.__setattr__(self, "web_audio_getters",   PluginLoader(plugin_type="web audio getter",
                                                                      module=plugins.parsers.audio_getters.web,
                                                                      configurable=True,
-                                                                     container_type=WebAudioGetterContainer))
+                                                                     container_type=WebAudioGetterContainer,
+                                                                     manifest=manifest))
 
     def get_language_package(self, name: str) -> LanguagePackageContainer:
         if (lang_pack := self.language_packages.get(name)) is None:
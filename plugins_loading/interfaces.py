@@ -24,6 +24,7 @@ class LanguagePackageInterface(Protocol):
     file_master_menu_label: str
 
     add_card_menu_label: str
+    add_words_menu_label: str
     search_inside_deck_menu_label: str
     statistics_menu_label: str
 
@@ -97,6 +98,17 @@ class LanguagePackageInterface(Protocol):
     add_word_additional_filter_entry_placeholder: str
     add_word_start_parsing_button_text: str
 
+    # batch define dialog
+    batch_define_window_title: str
+    batch_define_words_placeholder: str
+    batch_define_open_file_button_text: str
+    batch_define_choose_file_title: str
+    batch_define_start_button_text: str
+    batch_define_empty_words_message: str
+    batch_define_progress_title: str
+    batch_define_not_found_message_prefix: str
+    batch_define_errors_message_prefix: str
+
     # find dialog
     find_dialog_empty_query_message: str
     find_dialog_wrong_move_message: str
@@ -260,6 +272,7 @@ class DeckSavingFormatInterface(Protocol):
              saving_path: str,
              image_names_wrapper: Callable[[str], str],
              audio_names_wrapper: Callable[[str], str]):
+        """Expected to stream saved data with deck.iter_card_pages/iter_card_data/iter_audio_data"""
         ...
 
 
@@ -0,0 +1,101 @@
+import hashlib
+import json
+import os
+import site
+import sys
+from threading import Lock
+from typing import Optional
+
+from app_utils.journal import atomic_json_dump
+
+
+def get_plugin_signature(path: str) -> str:
+    """
+    :param path: plugin module file or plugin package directory
+    :return: digest of names, modification times and sizes of the plugin's source files
+    """
+    if os.path.isfile(path):
+        stat = os.stat(path)
+        return hashlib.sha1(f"{stat.st_mtime_ns}:{stat.st_size}".encode()).hexdigest()
+
+    entries = []
+    for directory, subdirectories, file_names in os.walk(path):
+        subdirectories[:] = [name for name in subdirectories if name != "__pycache__"]
+        for file_name in file_names:
+            if file_name.endswith(".py"):
+                file_path = os.path.join(directory, file_name)
+                stat = os.stat(file_path)
+                entries.append(f"{os.path.relpath(file_path, path)}:{stat.st_mtime_ns}:{stat.st_size}")
+    entries.sort()
+    return hashlib.sha1("\n".join(entries).encode()).hexdigest()
+
+
+def get_environment_signature() -> str:
+    """
+    :return: digest of the interpreter and of modification times of package directories.
+    Installing or removing a package changes modification time of its directory
+    """
+    package_directories = {*site.getsitepackages(), site.getusersitepackages(),
+                           *(path for path in sys.path if path.endswith(("site-packages", "dist-packages")))}
+    entries = [sys.executable, sys.version]
+    for directory in sorted(package_directories):
+        if os.path.isdir(directory):
+            entries.append(f"{directory}:{os.stat(directory).st_mtime_ns}")
+    return hashlib.sha1("\n".join(entries).encode()).hexdigest()
+
+
+class PluginManifest:
+    """
+    On-disk record of which plugins could be loaded, so that option menus are built without importing plugins.
+    Records are dropped as soon as plugin's source files change. All of them are dropped when installed packages
+    change, so that plugins with missing dependencies are checked again after the dependencies are installed.
+    Structure: {"environment": str, "plugins": {namespace name: {plugin name: {"signature": str, "loaded": bool}}}}
+    """
+    __slots__ = "path", "_data", "_lock"
+
+    def __init__(self, path: str):
+        self.path = path
+        self._data: Optional[dict] = None
+        self._lock = Lock()
+
+    def _get_data(self) -> dict[str, dict[str, dict]]:
+        """
+        :return: {namespace name: {plugin name: record}}
+        """
+        # read on first use so that creating the manifest doesn't touch the disk
+        if self._data is None:
+            environment = get_environment_signature()
+            try:
+                with open(self.path, "r", encoding="UTF-8") as f:
+                    self._data = json.load(f)
+            except (OSError, ValueError):
+                self._data = None
+            if not isinstance(self._data, dict) or self._data.get("environment") != environment or \
+                    not isinstance(self._data.get("plugins"), dict):
+                self._data = {"environment": environment, "plugins": {}}
+        return self._data["plugins"]
+
+    def is_loadable(self, namespace: str, name: str, signature: str) -> Optional[bool]:
+        """
+        :return: result of the last loading attempt or None if it is unknown for this version of the plugin
+        """
+        with self._lock:
+            record = self._get_data().get(namespace, {}).get(name)
+        if record is None or record.get("signature") != signature:
+            return None
+        return record.get("loaded")
+
+    def record(self, namespace: str, name: str, signature: str, loaded: bool) -> None:
+        new_record = {"signature": signature, "loaded": loaded}
+        with self._lock:
+            namespace_records = self._get_data().setdefault(namespace, {})
+            if namespace_records.get(name) == new_record:
+                return
+            namespace_records[name] = new_record
+            try:
+                if (directory := os.path.dirname(self.path)) and not os.path.isdir(directory):
+                    os.makedirs(directory)
+                atomic_json_dump(self._data, self.path, indent=1)
+            except OSError:
+                # the manifest is only a cache
+                pass
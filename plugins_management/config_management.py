@@ -1,9 +1,14 @@
+import atexit
 import json
 import os
 from collections import UserDict
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass, field
+from threading import Lock
 from typing import ClassVar, Any, Type, Sequence, Optional
 
+from app_utils.journal import atomic_write_text
+
 
 class Config(UserDict):
     @dataclass(slots=True, frozen=True)
@@ -106,9 +111,12 @@ class LoadableConfig(Config):
                                              docs=docs,
                                              initial_value={})
         self._conf_file_path = os.path.join(config_location, LoadableConfig.CONF_FILE_NAME)
+        # what is currently on disk (None if there is no valid file)
+        self._saved_text: Optional[str] = None
         self.load()
 
     def load(self) -> Optional["Config.SchemeCheckResults"]:
+        self._saved_text = None
         if not os.path.exists(self._conf_file_path):
             self.restore_defaults()
             self.save()
@@ -116,12 +124,73 @@ class LoadableConfig(Config):
         try:
             with open(self._conf_file_path, "r", encoding=LoadableConfig.ENCODING) as conf_file:
                 self.data = json.load(conf_file)
+            self._saved_text = self.serialize()
         except (ValueError, TypeError):  # Catches JSON decoding exceptions
             self.restore_defaults()
             self.save()
             return
         return self.validate_config(self.data, self.validation_scheme)
 
+    def serialize(self) -> str:
+        return json.dumps(self.data, indent=4)
+
     def save(self):
-        with open(self._conf_file_path, "w", encoding=LoadableConfig.ENCODING) as conf_file:
-            json.dump(self.data, conf_file, indent=4)
+        """
+        Deferred: the config is written on the next config_store.flush
+        """
+        config_store.mark_dirty(self)
+
+
+class ConfigStore:
+    """
+    Collects configs that have to be saved and writes them in one batch off the calling thread.
+    Configs whose data is the same as on disk are not rewritten
+    """
+    __slots__ = "_dirty", "_lock", "_pool"
+
+    def __init__(self):
+        # keyed by id because configs are unhashable
+        self._dirty: dict[int, LoadableConfig] = {}
+        self._lock = Lock()
+        # one writer, so that two flushes never write the same file simultaneously
+        self._pool = ThreadPoolExecutor(max_workers=1)
+
+    def mark_dirty(self, config: LoadableConfig) -> None:
+        with self._lock:
+            self._dirty[id(config)] = config
+
+    @staticmethod
+    def _write(batch: list[tuple[str, str]]) -> None:
+        for path, text in batch:
+            atomic_write_text(text, path)
+
+    def flush(self, background: bool = False) -> Optional[Future]:
+        """
+        :param background: whether to return right away instead of waiting for the writes to finish
+        """
+        with self._lock:
+            dirty = list(self._dirty.values())
+            self._dirty.clear()
+
+            # serialized in the calling thread, so that changes made after the flush don't get into the batch
+            batch = []
+            for config in dirty:
+                if (text := config.serialize()) != config._saved_text:
+                    config._saved_text = text
+                    batch.append((config._conf_file_path, text))
+        if not batch:
+            return None
+
+        try:
+            task = self._pool.submit(self._write, batch)
+        except RuntimeError:  # interpreter shutdown: the pool doesn't accept tasks anymore
+            self._write(batch)
+            return None
+        if background:
+            return task
+        task.result()
+        return None
+
+
+config_store = ConfigStore()
+atexit.register(config_store.flush)
@@ -0,0 +1,82 @@
+import os
+import time
+from threading import Lock
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# same as the default number of ThreadPoolExecutor workers, so that every worker
+# of the image search pool can hold its own connection to a host
+POOL_SIZE = min(32, (os.cpu_count() or 1) + 4)
+
+
+class SessionRegistry:
+    """
+    Keeps one keep-alive requests.Session (and thus one connection pool) per scheme and host.
+    requests.Session is safe to share between threads for plain GET and POST requests
+    """
+    __slots__ = "_pool_size", "_sessions", "_lock"
+
+    def __init__(self, pool_size: int = POOL_SIZE):
+        self._pool_size = pool_size
+        self._sessions: dict[tuple[str, str], requests.Session] = {}
+        self._lock = Lock()
+
+    def get_session(self, url: str) -> requests.Session:
+        split_url = urlsplit(url)
+        key = (split_url.scheme, split_url.netloc)
+        with self._lock:
+            if (session := self._sessions.get(key)) is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self._pool_size)
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                self._sessions[key] = session
+            return session
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        """
+        Drop-in replacement of requests.get
+        """
+        return self.get_session(url).get(url, **kwargs)
+
+    def close(self) -> None:
+        with self._lock:
+            for session in self._sessions.values():
+                session.close()
+            self._sessions.clear()
+
+
+class HostRateLimiter:
+    """
+    Spaces out requests to the same host by at least min_interval seconds.
+    Requests to different hosts don't wait for each other
+    """
+    __slots__ = "_min_interval", "_next_request_time", "_lock"
+
+    def __init__(self, min_interval: float):
+        self._min_interval = min_interval
+        self._next_request_time: dict[str, float] = {}
+        self._lock = Lock()
+
+    def wait(self, url: str) -> None:
+        """
+        Blocks calling thread until a request to the url's host is allowed
+        """
+        self.wait_host(urlsplit(url).netloc)
+
+    def wait_host(self, host: str) -> None:
+        """
+        Same as wait, but for callers that don't know exact urls
+        (like word parsers, whose requests all go to one site)
+        """
+        with self._lock:
+            now = time.monotonic()
+            request_time = max(now, self._next_request_time.get(host, now))
+            self._next_request_time[host] = request_time + self._min_interval
+        if (delay := request_time - now) > 0:
+            time.sleep(delay)
+
+
+session_registry = SessionRegistry()
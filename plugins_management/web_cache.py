@@ -0,0 +1,114 @@
+import json
+import struct
+import time
+from dataclasses import dataclass
+from threading import Lock
+from typing import Optional
+from urllib.parse import urlsplit
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from app_utils.storages import DiskLRUStore
+from consts.paths import WEB_CACHE_PATH
+from plugins_management.http_sessions import session_registry
+
+WEB_CACHE_MAX_SIZE = 256 * 2 ** 20
+
+_META_LENGTH = struct.Struct("<I")
+
+
+@dataclass(slots=True)
+class CacheStatistics:
+    hits: int = 0
+    misses: int = 0
+    offline_hits: int = 0
+
+
+class WebCache:
+    """
+    Shared cache of successful GET responses for web plugins.
+    Expired entries are still returned when the network is unavailable
+    """
+    __slots__ = "_store_path", "_max_size", "_store", "_store_lock", "_stats_lock", "_statistics"
+
+    def __init__(self, store_path: str, max_size: int):
+        self._store_path = store_path
+        self._max_size = max_size
+        self._store: Optional[DiskLRUStore] = None
+        self._store_lock = Lock()
+        self._stats_lock = Lock()
+        self._statistics: dict[str, CacheStatistics] = {}
+
+    def _get_store(self) -> DiskLRUStore:
+        # opened on first use so that importing plugins doesn't touch the disk
+        with self._store_lock:
+            if self._store is None:
+                self._store = DiskLRUStore(self._store_path, self._max_size)
+            return self._store
+
+    def _count(self, url: str, field: str) -> None:
+        host = urlsplit(url).netloc
+        with self._stats_lock:
+            host_statistics = self._statistics.setdefault(host, CacheStatistics())
+            setattr(host_statistics, field, getattr(host_statistics, field) + 1)
+
+    def get_statistics(self) -> dict[str, CacheStatistics]:
+        """
+        :return: {host: statistics}
+        """
+        with self._stats_lock:
+            return {host: CacheStatistics(s.hits, s.misses, s.offline_hits) for host, s in self._statistics.items()}
+
+    @staticmethod
+    def _serialize(response: requests.Response) -> bytes:
+        meta = json.dumps({"status_code": response.status_code,
+                           "url": response.url,
+                           "encoding": response.encoding,
+                           "headers": dict(response.headers)}).encode("UTF-8")
+        return _META_LENGTH.pack(len(meta)) + meta + response.content
+
+    @staticmethod
+    def _deserialize(value: bytes) -> requests.Response:
+        meta_length, = _META_LENGTH.unpack_from(value)
+        meta = json.loads(value[_META_LENGTH.size:_META_LENGTH.size + meta_length])
+
+        response = requests.Response()
+        response.status_code = meta["status_code"]
+        response.url = meta["url"]
+        response.encoding = meta["encoding"]
+        response.headers = CaseInsensitiveDict(meta["headers"])
+        response._content = value[_META_LENGTH.size + meta_length:]
+        return response
+
+    def get(self, url: str, ttl: float, **kwargs) -> requests.Response:
+        """
+        Drop-in replacement of requests.get. Requests go through the shared per-host sessions
+        :param ttl: how long (in seconds) a cached response stays fresh. Non-positive values disable caching
+        :param kwargs: requests.get keyword arguments
+        """
+        if ttl <= 0:
+            return session_registry.get(url, **kwargs)
+
+        store = self._get_store()
+        if (cached := store.get(url)) is not None:
+            value, created = cached
+            if time.time() - created < ttl:
+                self._count(url, "hits")
+                return self._deserialize(value)
+
+        self._count(url, "misses")
+        try:
+            response = session_registry.get(url, **kwargs)
+        except requests.RequestException:
+            if cached is None:
+                raise
+            self._count(url, "offline_hits")
+            return self._deserialize(cached[0])
+
+        if response.status_code == 200:
+            store.put(url, self._serialize(response))
+        return response
+
+
+web_cache = WebCache(store_path=str(WEB_CACHE_PATH), max_size=WEB_CACHE_MAX_SIZE)
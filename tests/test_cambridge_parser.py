@@ -0,0 +1,119 @@
+import glob
+import os
+import unittest
+from unittest import mock
+
+try:
+    import bs4
+    from plugins.parsers.word_parsers.web.cambridge import utils as cambridge
+except ImportError:  # dependencies of web parsers aren't installed
+    bs4 = cambridge = None
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "fixtures", "cambridge")
+
+
+def get_saved_pages() -> list[str]:
+    """
+    :return: paths of saved Cambridge dictionary pages
+    """
+    return sorted(glob.glob(os.path.join(FIXTURES_DIR, "*.html")))
+
+
+def reference_get_tags(tags_section):
+    """
+    get_tags as it was before it started to walk the section once
+    """
+    def find_all_tags(html_tag: str, params: dict) -> list:
+        tags = []
+        if tags_section is None:
+            return tags
+
+        found_tags = tags_section.find_all(html_tag, params)
+        for tag in found_tags:
+            tag_grandparent = tag.parent.parent.get("class")
+            # var - var dvar; group - inf-group dinfg
+            if not any("var" in x or "group" in x for x in tag_grandparent):
+                tag_text = tag.text.strip()
+                if tag_text:
+                    tags.append(tag_text)
+        return tags
+
+    level = find_all_tags("span", {"class": "epp-xref"})
+    labels_and_codes = find_all_tags("span", {"class": "gram dgram"})
+    region = find_all_tags("span", {"class": "region dregion"})
+    usage = find_all_tags("span", {"class": "usage dusage"})
+    domain = find_all_tags("span", {"class": "domain ddomain"})
+    return level, labels_and_codes, region, usage, domain
+
+
+def reference_parse_page(page_content: bytes, dictionary_index=0):
+    """
+    Parser as it was before parse_page started to skip everything outside of dictionary blocks:
+    tree of the whole page and the old get_tags. The rest of the extraction didn't change
+    """
+    with mock.patch.object(cambridge, "get_tags", reference_get_tags):
+        return cambridge.parse_soup(bs4.BeautifulSoup(page_content, "html.parser"), dictionary_index)
+
+
+@unittest.skipIf(cambridge is None, "bs4 or requests isn't installed")
+class CambridgeParserTest(unittest.TestCase):
+    def test_pages_are_saved(self):
+        self.assertTrue(get_saved_pages())
+
+    def test_matches_reference_parser(self):
+        for page_path in get_saved_pages():
+            with open(page_path, "rb") as f:
+                page_content = f.read()
+            for dictionary_index in range(3):
+                with self.subTest(page=os.path.basename(page_path), dictionary_index=dictionary_index):
+                    self.assertEqual(reference_parse_page(page_content, dictionary_index),
+                                     cambridge.parse_page(page_content, dictionary_index))
+
+    def test_parsed_entries(self):
+        with open(os.path.join(FIXTURES_DIR, "bear.html"), "rb") as f:
+            word_info = dict(cambridge.parse_page(f.read()))
+
+        self.assertEqual(["bear", "bear fruit", "bear down on sb/sth", "bear in mind"], list(word_info))
+        self.assertEqual(["verb", "noun"], list(word_info["bear"]))
+
+        verb = word_info["bear"]["verb"]
+        self.assertEqual(["to accept, tolerate, or endure especially something unpleasant",
+                          "to be able to accept something that is difficult",
+                          "to carry and move something to a different place"], verb["definitions"])
+        self.assertEqual([["B2"], [], ["C2"]], verb["level"])
+        self.assertEqual([["[ T ]"], ["[ I ]"], ["[ T ]"]], verb["labels_and_codes"])
+        # usage of the alternative term is skipped
+        self.assertEqual([[], ["formal"], ["formal"]], verb["usage"])
+        self.assertEqual([[], [], ["UK"]], verb["region"])
+        self.assertEqual([["past tense bore", "past participle borne"]] * 3, verb["irregular_forms"])
+        self.assertEqual(["/beər/"], verb["UK_IPA"])
+        self.assertEqual(["https://dictionary.cambridge.org//media/english/us_pron/b/bea/bear_/bear.mp3"],
+                         verb["US_audio_links"])
+
+        phrase = word_info["bear fruit"]["verb"]
+        self.assertEqual([["(bear a crop)"]], phrase["alt_terms"])
+        self.assertEqual([["C1"]], phrase["level"])
+        self.assertEqual([["agriculture"]], phrase["domain"])
+
+        noun = word_info["bear"]["noun"]
+        self.assertEqual([["(informal bruin)"], ["(informal bruin)"]], noun["alt_terms"])
+        self.assertEqual(["https://dictionary.cambridge.org/images/thumb/bear_noun_002_03007.jpg?version=5.0.297",
+                          ""], noun["image_links"])
+        self.assertEqual([["a brown bear", "a polar bear"], []], noun["examples"])
+        self.assertEqual([], noun["US_audio_links"])
+
+        self.assertEqual([["UK"]], word_info["bear down on sb/sth"]["phrasal verb"]["region"])
+        self.assertEqual([["(keep in mind)"]], word_info["bear in mind"]["idiom"]["alt_terms"])
+
+    def test_american_dictionary(self):
+        with open(os.path.join(FIXTURES_DIR, "bear.html"), "rb") as f:
+            word_info = dict(cambridge.parse_page(f.read(), dictionary_index=1))
+
+        verb = word_info["bear"]["verb"]
+        self.assertEqual([], verb["UK_IPA"])
+        self.assertEqual(["/ber/"], verb["US_IPA"])
+        self.assertEqual([["past tense bore", "born"]], verb["irregular_forms"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,62 @@
+import random
+import unittest
+
+from app_utils.string_utils import remove_special_chars
+
+DEFAULT_SPECIAL_CHARS = '№!"#$%&\'()*+,-./:;<=>?@[\\]^_`{|}~ '
+
+
+def reference_remove_special_chars(text, sep=" ", special_chars=DEFAULT_SPECIAL_CHARS):
+    """
+    Character by character implementation that remove_special_chars replaced
+    """
+    new_text = ""
+    start_index = 0
+    while start_index < len(text) and text[start_index] in special_chars:
+        start_index += 1
+
+    while start_index < len(text):
+        if text[start_index] in special_chars:
+            while text[start_index] in special_chars:
+                start_index += 1
+                if start_index >= len(text):
+                    return new_text
+            new_text += sep
+        new_text += text[start_index]
+        start_index += 1
+    return new_text.strip(sep)
+
+
+class RemoveSpecialCharsTest(unittest.TestCase):
+    # special chars of regular expressions and of replacement strings are included on purpose
+    ALPHABET = 'ab-_ \\!^]["\'/:*?№.\n\t'
+    N_CASES = 20_000
+
+    def assert_matches_reference(self, *args):
+        self.assertEqual(reference_remove_special_chars(*args), remove_special_chars(*args), args)
+
+    def test_examples(self):
+        for args in (("", "_"),
+                     ("  good-looking!  ", "_"),
+                     ("phrasal verb", "-"),
+                     ("a...b", "\\1"),
+                     ("[a]b", " ", "]["),
+                     ("a-b", "-", ""),
+                     ("-a-", "-", "")):
+            with self.subTest(args=args):
+                self.assert_matches_reference(*args)
+
+    def test_random_inputs(self):
+        rng = random.Random(0)
+        for _ in range(self.N_CASES):
+            text = "".join(rng.choices(self.ALPHABET, k=rng.randint(0, 12)))
+            sep = "".join(rng.choices(self.ALPHABET, k=rng.randint(0, 2)))
+            if rng.random() < 0.5:
+                special_chars = "".join(rng.choices(self.ALPHABET, k=rng.randint(0, 5)))
+                self.assert_matches_reference(text, sep, special_chars)
+            else:
+                self.assert_matches_reference(text, sep)
+
+
+if __name__ == "__main__":
+    unittest.main()